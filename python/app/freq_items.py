@@ -12,14 +12,11 @@ itemCount = int(sys.argv[1])
 tripletCount = int(sys.argv[2])
 xactionCount = int(sys.argv[3])
 
-items = []
 triplets = []
 pairs = []
 singles = []
 
-for i in range(0,itemCount):
-	it = genID(10)
-	items.append(it)
+items = genIDArr(itemCount, 10, True)
 
 #generate triplets
 for i in range(0,tripletCount):
@@ -59,8 +56,9 @@ curTime = int(time.time())
 day = 24 * 60 * 60
 xactionTime = curTime - 30 * day
 
+xactionIDs = genIDArr(xactionCount, 12)
 for i in range(0,xactionCount):
-	xactionID = genID(12)
+	xactionID = xactionIDs[i]
 	xactionTime = xactionTime + randint(10,300)
 	xactionItems = []
 	r = randint(0,100)
@@ -87,7 +85,7 @@ for i in range(0,xactionCount):
 		xactionItems.append(selectRandomFromList(items))
 
 	flatXactionItems = ",".join(flatten(xactionItems))
-	print "%s,%d,%s" %(xactionID, xactionTime, flatXactionItems)
+	print("%s,%d,%s" %(xactionID, xactionTime, flatXactionItems))
 
 	
 
@@ -271,11 +271,7 @@ elif op == "genDummyVar":
 		catVars[9] = ethnicity
 		rs = 11
 	dummyVarGen = DummyVarGenerator(rs, catVars, "1", "0", ",")
-	fp = open(file, "r")
-	for row in fp:
-		newRow = dummyVarGen.processRow(row)
-		print(newRow.strip())
-	fp.close()
+	dummyVarGen.encodeFile(file)
 
 
 elif op == "addNoise":
@@ -0,0 +1,73 @@
+#!/usr/local/bin/python3
+
+# avenir-python: Machine Learning
+# Author: Pranab Ghosh
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you
+# may not use this file except in compliance with the License. You may
+# obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Package imports
+import os
+import sys
+import subprocess
+
+"""
+import time benchmark for library modules and the CLI tools built on DataExplorer, guards cold start 
+budget. Tools are imported as modules from this directory, their main block not being run
+usage: ./impbench.py <budget in sec> <num runs> [module ...]
+"""
+
+#library modules and tools timed by default
+defModNames = ["daexp", "tsstat", "causal", "colid", "loan_approve"]
+
+def importTime(modName, libPaths, appDir):
+	"""
+	import time of a module in a fresh interpreter, None if import fails
+
+	Parameters
+		modName : module name
+		libPaths : library paths
+		appDir : tool directory, working directory of the interpreter as tools add library paths relative to it
+	"""
+	code = "import sys,time\n"
+	for p in [appDir] + libPaths:
+		code += "sys.path.append({})\n".format(repr(p))
+	code += "st = time.perf_counter()\nimport {}\nprint(time.perf_counter() - st)\n".format(modName)
+	res = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=appDir)
+	if res.returncode != 0:
+		print("{}  import failed  {}".format(modName, res.stderr.strip().split("\n")[-1]))
+		return None
+	return float(res.stdout.strip().split("\n")[-1])
+
+if __name__ == "__main__":
+	assert len(sys.argv) >= 3, "ivalid number of command line args, expecting at least 2"
+	budget = float(sys.argv[1])
+	numRuns = int(sys.argv[2])
+	modNames = sys.argv[3:] if len(sys.argv) > 3 else defModNames
+	appDir = os.path.dirname(os.path.abspath(__file__))
+	libPaths = list(map(lambda d : os.path.abspath(os.path.join(appDir, d)), ["../lib", "../mlextra", "../supv"]))
+
+	#best of runs, first run warms up file system cache
+	failed = list()
+	for modName in modNames:
+		elapsed = importTime(modName, libPaths, appDir)
+		if elapsed is None:
+			failed.append(modName)
+			continue
+		for _ in range(numRuns - 1):
+			elapsed = min(elapsed, importTime(modName, libPaths, appDir))
+		status = "ok" if elapsed <= budget else "over budget"
+		print("{}  import time {:.3f} sec  {}".format(modName, elapsed, status))
+		if elapsed > budget:
+			failed.append(modName)
+	if len(failed) > 0:
+		sys.exit(1)
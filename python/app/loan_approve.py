@@ -352,9 +352,7 @@ class LoanApprove:
 		rSize = NFEAT_EXT if extra else NFEAT
 		rSize += 2
 		dummyVarGen = DummyVarGenerator(rSize, catVars, "1", "0", ",")
-		for row in fileRecGen(fileName, None):
-			newRow = dummyVarGen.processRow(row)
-			print (newRow)
+		dummyVarGen.encodeFile(fileName)
 
 	def encodeLabel(self, fileName):
 		"""
@@ -364,9 +362,7 @@ class LoanApprove:
 		catVars[1] = self.marStatus
 		catVars[10] = self.loanTerm
 		encoder = CatLabelGenerator(catVars, ",")
-		for row in fileRecGen(fileName, None):
-			newRow = encoder.processRow(row)
-			print (newRow)
+		encoder.encodeFile(fileName)
 
 def mutatorOne(r):
 	""" shifts and scales data  """
@@ -19,33 +19,39 @@ import os
 import sys
 import numpy as np
 import pandas as pd
-import sklearn as sk
-from sklearn import preprocessing
-from sklearn import metrics
 import random
 from math import *
 from decimal import Decimal
 import pprint
-from statsmodels.graphics import tsaplots
-from statsmodels.tsa import stattools as stt
-from statsmodels.stats import stattools as sstt
-from sklearn.linear_model import LinearRegression
-from matplotlib import pyplot as plt
-from scipy import stats as sta
-from statsmodels.tsa.seasonal import seasonal_decompose
-from sklearn.ensemble import IsolationForest
-from sklearn.neighbors import LocalOutlierFactor
-from sklearn.svm import OneClassSVM
-from sklearn.covariance import EllipticEnvelope
-from sklearn.mixture import GaussianMixture
-from sklearn.cluster import KMeans
-from sklearn.decomposition import PCA
-import hurst
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from util import *
 from mlutil import *
 from sampler import *
 from stats import *
 
+#heavy dependencies imported on first use
+sk = LazyImport("sklearn")
+preprocessing = LazyImport("sklearn.preprocessing")
+metrics = LazyImport("sklearn.metrics")
+tsaplots = LazyImport("statsmodels.graphics.tsaplots")
+stt = LazyImport("statsmodels.tsa.stattools")
+sstt = LazyImport("statsmodels.stats.stattools")
+seasonal_decompose = LazyImport("statsmodels.tsa.seasonal", "seasonal_decompose")
+LinearRegression = LazyImport("sklearn.linear_model", "LinearRegression")
+plt = LazyImport("matplotlib.pyplot")
+sta = LazyImport("scipy.stats")
+IsolationForest = LazyImport("sklearn.ensemble", "IsolationForest")
+LocalOutlierFactor = LazyImport("sklearn.neighbors", "LocalOutlierFactor")
+OneClassSVM = LazyImport("sklearn.svm", "OneClassSVM")
+EllipticEnvelope = LazyImport("sklearn.covariance", "EllipticEnvelope")
+GaussianMixture = LazyImport("sklearn.mixture", "GaussianMixture")
+KMeans = LazyImport("sklearn.cluster", "KMeans")
+PCA = LazyImport("sklearn.decomposition", "PCA")
+hurst = LazyImport("hurst")
+joblib = LazyImport("joblib")
+
 """
 Load  data from a CSV file, data frame, numpy array or list
 Each data set (array like) is given a name while loading
@@ -70,10 +76,88 @@ class DataSetMetaData:
 		self.notes.append(note)
 
 
+class LazyDataSets(dict):
+	"""
+	data sets keyed by name, with data sets saved in npy or object files loaded on first access
+	"""
+	def addLazy(self, dsn, filePath, mmapMode, asList, vocab=None):
+		"""
+		adds data set to be loaded later
+		
+		Parameters
+			dsn: data set name
+			filePath : npy file path, or saved object file path
+			mmapMode : memory map mode
+			asList : True if data set is to be converted to list
+			vocab : list of categorical values, npy file having value indexes
+		"""
+		super().__setitem__(dsn, (LazyDataSets, filePath, mmapMode, asList, vocab))
+
+	def __getitem__(self, dsn):
+		"""
+		gets data set, loading it if necessary
+		
+		Parameters
+			dsn: data set name
+		"""
+		data = super().__getitem__(dsn)
+		if type(data) == tuple and len(data) == 5 and data[0] is LazyDataSets:
+			_, filePath, mmapMode, asList, vocab = data
+			if not filePath.endswith(".npy"):
+				data = restoreObject(filePath)
+			elif vocab is not None:
+				data = list(map(lambda c : vocab[c], np.load(filePath).tolist()))
+			else:
+				data = np.load(filePath, mmap_mode=None if asList else mmapMode)
+				if asList:
+					data = data.tolist()
+			super().__setitem__(dsn, data)
+		return data
+
+	def get(self, dsn, default=None):
+		"""
+		gets data set, loading it if necessary, or default if absent
+		
+		Parameters
+			dsn: data set name
+			default : default value
+		"""
+		return self[dsn] if dsn in self else default
+
+	def values(self):
+		"""
+		all data sets, loading them if necessary
+		"""
+		return list(map(lambda dsn : self[dsn], self.keys()))
+
+	def items(self):
+		"""
+		all data set name and data set pairs, loading data sets if necessary
+		"""
+		return list(map(lambda dsn : (dsn, self[dsn]), self.keys()))
+
+	def pop(self, dsn, *default):
+		"""
+		removes data set
+		
+		Parameters
+			dsn: data set name
+			default : default value
+		"""
+		if dsn in self:
+			data = self[dsn]
+			super().pop(dsn)
+			return data
+		return super().pop(dsn, *default)
+
+
 class DataExplorer:
 	"""
 	various data exploration functions
 	"""
+	wsVersion = 2
+	wsManifest = "manifest.json"
+
 	def __init__(self, verbose=True):
 		"""
 		initialize
@@ -85,6 +169,9 @@ class DataExplorer:
 		self.metaData = dict()
 		self.pp = pprint.PrettyPrinter(indent=4)
 		self.verbose = verbose
+		self.discCache = dict()
+		self.summaries = dict()
+		self.outlierModels = dict()
 
 	def setVerbose(self, verbose):
 		"""
@@ -95,33 +182,140 @@ class DataExplorer:
 		"""
 		self.verbose = verbose
 		
-	def save(self, filePath):
+	def save(self, filePath, columnar=False):
 		"""
 		save checkpoint
 		
 		Parameters
-			filePath : path of file where saved
+			filePath : path of file where saved, directory path for columnar format
+			columnar : True to save each data set as a separate npy file with a manifest for meta data
 		"""
 		self.__printBanner("saving workspace")
-		ws = dict()
-		ws["data"] = self.dataSets
-		ws["metaData"] = self.metaData
-		saveObject(ws, filePath)
+		data = {k : self.dataSets[k] for k in self.dataSets.keys()}
+		if columnar:
+			self.__saveColumnar(data, filePath)
+		else:
+			ws = dict()
+			ws["data"] = data
+			ws["metaData"] = self.metaData
+			ws["summaries"] = self.summaries
+			saveObject(ws, filePath)
 		self.__printDone()
 
-	def restore(self, filePath):
+	def restore(self, filePath, mmapMode="r"):
 		"""
-		restore checkpoint
+		restore checkpoint. For columnar format, each data set is loaded memory mapped on first access
 		
 		Parameters
-			filePath : path of file from where to store
+			filePath : path of file from where to store, directory path for columnar format
+			mmapMode : memory map mode for columnar format, r for read only and c for copy on write
 		"""
 		self.__printBanner("restoring workspace")
-		ws = restoreObject(filePath)
-		self.dataSets = ws["data"]
-		self.metaData = ws["metaData"]
+		if os.path.isdir(filePath):
+			self.__restoreColumnar(filePath, mmapMode)
+		else:
+			ws = restoreObject(filePath)
+			self.dataSets = ws["data"]
+			self.metaData = ws["metaData"]
+			self.summaries = ws.get("summaries", dict())
+		self.discCache = dict()
 		self.__printDone()
 
+	def __saveColumnar(self, data, dirPath):
+		"""
+		saves data sets as npy files and meta data and notes in a manifest file. Categorical data sets
+		are saved as value indexes with the values in the manifest, or as saved objects when the values
+		are not plain scalars
+		
+		Parameters
+			data : dictionary of data sets
+			dirPath : directory path
+		"""
+		#all data sets checked and converted before any file is written
+		dsl = list()
+		arrays = list()
+		for i, (dsn, ds) in enumerate(data.items()):
+			mdata = self.metaData[dsn]
+			dsd = {"name" : dsn, "dtype" : mdata.dtype, "notes" : mdata.notes}
+			if mdata.dtype == DataSetMetaData.dtypeCat:
+				(codes, vocab) = catCodes(ds)
+				if codes is None:
+					dsd["file"] = "ds{}.pkl".format(i)
+					arrays.append(list(ds))
+				else:
+					dsd["file"] = "ds{}.npy".format(i)
+					dsd["vocab"] = vocab
+					arrays.append(codes)
+			else:
+				try:
+					arr = np.asarray(ds)
+				except ValueError:
+					arr = None
+				assert arr is not None and arr.dtype.kind in "biuf", "data set {} is not homogeneous numeric data and can not be saved".format(dsn)
+				dsd["file"] = "ds{}.npy".format(i)
+				arrays.append(arr)
+			dsl.append(dsd)
+		
+		os.makedirs(dirPath, exist_ok=True)
+		for dsd, arr in zip(dsl, arrays):
+			#temp file and replace, existing file may be memory mapped by a restored workspace
+			fpath = os.path.join(dirPath, dsd["file"])
+			if dsd["file"].endswith(".npy"):
+				saveArrayAtomic(fpath, arr)
+			else:
+				saveObject(arr, fpath)
+		manifest = dict()
+		manifest["version"] = DataExplorer.wsVersion
+		manifest["dataSets"] = dsl
+		manifest["summaries"] = list(map(lambda dsn : {"name" : dsn, "notes" : self.metaData[dsn].notes}, self.summaries.keys()))
+		if self.summaries:
+			saveObject(self.summaries, os.path.join(dirPath, "summaries.pkl"))
+		
+		#manifest last, so that an interrupted save does not leave a manifest with missing files
+		mfPath = os.path.join(dirPath, DataExplorer.wsManifest)
+		(fd, tmpPath) = tempFileFor(mfPath)
+		try:
+			with os.fdopen(fd, "w") as fh:
+				json.dump(manifest, fh, indent=2)
+			os.replace(tmpPath, mfPath)
+		except BaseException:
+			os.remove(tmpPath)
+			raise
+		
+		#files left over from an earlier save of a larger work space
+		files = set(map(lambda dsd : dsd["file"], dsl))
+		if self.summaries:
+			files.add("summaries.pkl")
+		for fname in os.listdir(dirPath):
+			if (re.fullmatch(r"ds\d+\.(npy|pkl)", fname) or fname == "summaries.pkl") and fname not in files:
+				os.remove(os.path.join(dirPath, fname))
+
+	def __restoreColumnar(self, dirPath, mmapMode):
+		"""
+		restores meta data from manifest file, with data sets to be loaded lazily
+		
+		Parameters
+			dirPath : directory path
+			mmapMode : memory map mode
+		"""
+		with open(os.path.join(dirPath, DataExplorer.wsManifest), "r") as fh:
+			manifest = json.load(fh)
+		assertLesserEqual(manifest["version"], DataExplorer.wsVersion, "unsupported workspace version")
+		self.dataSets = LazyDataSets()
+		self.metaData = dict()
+		for dsd in manifest["dataSets"]:
+			dsn = dsd["name"]
+			dtype = dsd["dtype"]
+			self.dataSets.addLazy(dsn, os.path.join(dirPath, dsd["file"]), mmapMode, dtype == DataSetMetaData.dtypeCat, 
+			dsd.get("vocab"))
+			mdata = DataSetMetaData(dtype)
+			mdata.notes = dsd["notes"]
+			self.metaData[dsn] = mdata
+		self.summaries = restoreObject(os.path.join(dirPath, "summaries.pkl")) if manifest.get("summaries") else dict()
+		for dsd in manifest.get("summaries", list()):
+			mdata = DataSetMetaData(DataSetMetaData.dtypeNum)
+			mdata.notes = dsd["notes"]
+			self.metaData[dsd["name"]] = mdata
 
 	def queryFileData(self, filePath,  *columns):
 		"""
@@ -134,10 +328,8 @@ class DataExplorer:
 		self.__printBanner("querying column data type from a data frame")
 		lcolumns = list(columns)
 		noHeader = type(lcolumns[0]) ==  int
-		if noHeader:			
-			df = pd.read_csv(filePath,  header=None) 
-		else:
-			df = pd.read_csv(filePath,  header=0) 
+		with openTextFile(filePath) as fh:
+			df = pd.read_csv(fh,  header=None if noHeader else 0)
 		return self.queryDataFrameData(df,  *columns)
 
 	def queryDataFrameData(self, df,  *columns):
@@ -217,6 +409,51 @@ class DataExplorer:
 		self.addFileData(filePath, False, *columns)
 		self.__printDone()
 
+	def addFileNumericDataSummary(self, filePath, chunkSize, *columns):
+		"""
+		add numeric columns from a file as mergeable summaries, reading the file in chunks without
+		retaining the data. Summary data sets support getStats, getFreqDistr, getPercentile and getNullCount
+		
+		Parameters
+			filePath : path of file with data
+			chunkSize : num of rows in a chunk
+			columns : indexes followed by column names or column names
+		"""
+		self.__printBanner("adding numeric column summaries from a file")
+		columns = list(columns)
+		noHeader = type(columns[0]) ==  int
+		if noHeader:
+			nCols = int(len(columns) / 2)
+			colIndexes = columns[:nCols]
+			cnames = columns[nCols:]
+		else:
+			colIndexes = columns
+			cnames = columns
+		summaries = list(map(lambda c : ColumnSummary(), cnames))
+		with openTextFile(filePath) as fh:
+			reader = pd.read_csv(fh, header=None if noHeader else 0, usecols=colIndexes, chunksize=chunkSize)
+			for df in reader:
+				for ci, cs in zip(colIndexes, summaries):
+					col = df[ci]
+					assert isNumeric(col), "data is not numeric"
+					cs.add(col.to_numpy())
+		for cn, cs in zip(cnames, summaries):
+			if cn in self.dataSets:
+				self.dataSets.pop(cn)
+			self.summaries[cn] = cs
+			self.metaData[cn] = DataSetMetaData(DataSetMetaData.dtypeNum)
+			self.__clearDiscCache(cn)
+		self.__printDone()
+
+	def __getSummary(self, ds):
+		"""
+		gets column summary if the data set has summary only
+		
+		Parameters
+			ds: data set name or list or numpy array
+		"""
+		return self.summaries.get(ds) if type(ds) == str else None
+
 	def addFileData(self, filePath,  numeric, *columns):
 		"""
 		add columns from a file
@@ -228,10 +465,8 @@ class DataExplorer:
 		"""
 		columns = list(columns)
 		noHeader = type(columns[0]) ==  int
-		if noHeader:			
-			df = pd.read_csv(filePath,  header=None) 
-		else:
-			df = pd.read_csv(filePath,  header=0) 
+		with openTextFile(filePath) as fh:
+			df = pd.read_csv(fh,  header=None if noHeader else 0)
 		self.addDataFrameData(df, numeric, *columns)
 
 	def addDataFrameNumericData(self,filePath,  *columns):
@@ -306,6 +541,19 @@ class DataExplorer:
 		"""
 		self.dataSets[dsn] = data
 		self.metaData[dsn] = DataSetMetaData(dtype)
+		self.summaries.pop(dsn, None)
+		self.__clearDiscCache(dsn)
+
+	def __clearDiscCache(self, dsn):
+		"""
+		removes cached discretized data for a data set
+		
+		Parameters
+			dsn: data set name
+		"""
+		for k in list(self.discCache.keys()):
+			if k[0] == dsn:
+				self.discCache.pop(k)
 
 
 	def addListNumericData(self, ds,  name):
@@ -350,6 +598,8 @@ class DataExplorer:
 		dtype = DataSetMetaData.dtypeNum if numeric else DataSetMetaData.dtypeBin
 		self.dataSets[name] = np.array(ds)
 		self.metaData[name] = DataSetMetaData(dtype)
+		self.summaries.pop(name, None)
+		self.__clearDiscCache(name)
 
 
 	def addFileCatData(self, filePath,  *columns):
@@ -363,10 +613,8 @@ class DataExplorer:
 		self.__printBanner("adding categorical columns from a file")
 		columns = list(columns)
 		noHeader = type(columns[0]) ==  int
-		if noHeader:			
-			df = pd.read_csv(filePath,  header=None) 
-		else:
-			df = pd.read_csv(filePath,  header=0) 
+		with openTextFile(filePath) as fh:
+			df = pd.read_csv(fh,  header=None if noHeader else 0)
 
 		self.addDataFrameCatData(df,  *columns)
 		self.__printDone()
@@ -421,9 +669,13 @@ class DataExplorer:
 			ds : data set name
 		"""
 		self.__printBanner("removing data set", ds)
-		assert ds in self.dataSets, "data set {} does not exist, please add it first".format(ds)
-		self.dataSets.pop(ds)
+		assert ds in self.dataSets or ds in self.summaries, "data set {} does not exist, please add it first".format(ds)
+		if ds in self.summaries:
+			self.summaries.pop(ds)
+		else:
+			self.dataSets.pop(ds)
 		self.metaData.pop(ds)
+		self.__clearDiscCache(ds)
 		names = self.showNames()
 		self.__printDone()	
 		return names
@@ -437,7 +689,7 @@ class DataExplorer:
 			note: note text
 		"""
 		self.__printBanner("adding note")
-		assert ds in self.dataSets, "data set {} does not exist, please add it first".format(ds)
+		assert ds in self.metaData, "data set {} does not exist, please add it first".format(ds)
 		mdata = self.metaData[ds]
 		mdata.addNote(note)
 		self.__printDone()
@@ -450,7 +702,7 @@ class DataExplorer:
 			ds : data set name or list or numpy array with data
 		"""
 		self.__printBanner("getting notes")
-		assert ds in self.dataSets, "data set {} does not exist, please add it first".format(ds)		
+		assert ds in self.metaData, "data set {} does not exist, please add it first".format(ds)		
 		mdata = self.metaData[ds]
 		dnotes = mdata.notes
 		if self.verbose:
@@ -639,6 +891,15 @@ class DataExplorer:
 			nbins: num of bins
 		"""
 		self.__printBanner("getting histogram", ds)
+		cs = self.__getSummary(ds)
+		if cs is not None:
+			#same default limits as relfreq
+			binsize = (cs.vmax - cs.vmin) / (2.0 * (nbins - 1))
+			lowLimit = cs.vmin - binsize
+			binsize = (cs.vmax - cs.vmin + 2 * binsize) / nbins
+			frequency = cs.histogram(nbins, (lowLimit, lowLimit + nbins * binsize)) / cs.count
+			result = self.__printResult("frequency", frequency, "lowLimit", lowLimit, "binsize", binsize, "extraPoints", 0)
+			return result
 		data = self.getNumericData(ds)
 		frequency, lowLimit, binsize, extraPoints = sta.relfreq(data, numbins=nbins)
 		result = self.__printResult("frequency", frequency, "lowLimit", lowLimit, "binsize", binsize, "extraPoints", extraPoints)
@@ -880,8 +1141,12 @@ class DataExplorer:
 			value: the value
 		"""
 		self.__printBanner("getting percentile", ds)
-		data = self.getNumericData(ds)
-		percent = sta.percentileofscore(data, value)
+		cs = self.__getSummary(ds)
+		if cs is not None:
+			percent = cs.percentileOfScore(value)
+		else:
+			data = self.getNumericData(ds)
+			percent = sta.percentileofscore(data, value)
 		result = self.__printResult("value", value, "percentile", percent)
 		return result
 
@@ -1184,9 +1449,19 @@ class DataExplorer:
 		
 		Parameters
 			ds: data set name or list or numpy array
-			nextreme: num of extreme values
+			nextreme: num of extreme values, for summary data set not more than the num retained by the 
+				summary
 		"""
 		self.__printBanner("getting summary statistics", ds)
+		cs = self.__getSummary(ds)
+		if cs is not None:
+			assertLesserEqual(nextreme, cs.nextreme, "summary data set {} retains only {} extreme values".format(ds, cs.nextreme))
+			stat = cs.getStat()
+			stat["n smallest"] = stat["n smallest"][:nextreme]
+			stat["n largest"] = stat["n largest"][::-1][:nextreme]
+			if self.verbose:
+				self.pp.pprint(stat)
+			return stat
 		data = self.getNumericData(ds)
 		stat = dict()
 		stat["length"] = len(data)
@@ -1550,29 +1825,166 @@ class DataExplorer:
 		result = self.__printResult("numOutliers", doul.shape[0], "outliers", doul, "dataWithoutOutliers", dwoul)	
 		return result
 
+	def fitOutlierModel(self, name, algo, param, *dsl, njobs=1):
+		"""
+		fits outlier model and keeps it by name for scoring later
+		
+		Parameters
+			name : model name
+			algo : algorithm isoForest, localFactor, supVecMach or covarDeterminant
+			param : contamination, nu for supVecMach
+			dsl: list of data set name or list or numpy array
+			njobs : num of parallel jobs, for algorithms that support it
+		"""
+		self.__printBanner("fitting outlier model " + name, *dsl)
+		assert param >= 0 and param <= 0.5, "contamination or error upper bound outside valid range"
+		dmat = self.__stackData(*dsl)
+		if algo == "isoForest":
+			model = IsolationForest(contamination=param, n_jobs=njobs)
+		elif algo == "localFactor":
+			model = LocalOutlierFactor(contamination=param, novelty=True, n_jobs=njobs)
+		elif algo == "supVecMach":
+			model = OneClassSVM(nu=param)
+		elif algo == "covarDeterminant":
+			model = EllipticEnvelope(contamination=param)
+		else:
+			raise ValueError("invalid outlier algorithm " + algo)
+		model.fit(dmat)
+		self.outlierModels[name] = (algo, model)
+		self.__printDone()
+
+	def scoreOutlierModel(self, name, *dsl, njobs=1, chunkSize=100000):
+		"""
+		scores data with a fitted outlier model, lower score being more anomalous. Data is scored 
+		in chunks in parallel
+		
+		Parameters
+			name : model name
+			dsl: list of data set name or list or numpy array
+			njobs : num of parallel scoring threads
+			chunkSize : num of rows in a chunk
+		"""
+		self.__printBanner("scoring with outlier model " + name, *dsl)
+		assert name in self.outlierModels, "outlier model {} does not exist, please fit or restore it first".format(name)
+		model = self.outlierModels[name][1]
+		dmat = self.__stackData(*dsl)
+		chunks = list(map(lambda b : dmat[b:b+chunkSize], range(0, dmat.shape[0], chunkSize)))
+		scoreChunk = lambda c : (model.predict(c), model.decision_function(c))
+		if njobs == 1 or len(chunks) == 1:
+			res = list(map(scoreChunk, chunks))
+		else:
+			with ThreadPoolExecutor(max_workers=njobs) as executor:
+				res = list(executor.map(scoreChunk, chunks))
+		ypred = np.concatenate(list(map(lambda r : r[0], res)))
+		scores = np.concatenate(list(map(lambda r : r[1], res)))
+		mask = ypred == -1
+		doul = dmat[mask, :]
+		dwoul = dmat[~mask, :]
+		result = self.__printResult("numOutliers", doul.shape[0], "outliers", doul, "dataWithoutOutliers", dwoul, 
+		"predictions", ypred, "scores", scores)
+		return result
+
+	def saveOutlierModel(self, name, filePath):
+		"""
+		saves fitted outlier model
+		
+		Parameters
+			name : model name
+			filePath : path of file where saved
+		"""
+		self.__printBanner("saving outlier model " + name)
+		assert name in self.outlierModels, "outlier model {} does not exist, please fit it first".format(name)
+		joblib.dump(self.outlierModels[name], filePath)
+		self.__printDone()
+
+	def restoreOutlierModel(self, name, filePath):
+		"""
+		restores fitted outlier model
+		
+		Parameters
+			name : model name
+			filePath : path of file from where restored
+		"""
+		self.__printBanner("restoring outlier model " + name)
+		self.outlierModels[name] = joblib.load(filePath)
+		self.__printDone()
+
+	def remOutlierModel(self, name):
+		"""
+		removes fitted outlier model
+		
+		Parameters
+			name : model name
+		"""
+		self.__printBanner("removing outlier model " + name)
+		assert name in self.outlierModels, "outlier model {} does not exist".format(name)
+		self.outlierModels.pop(name)
+		self.__printDone()
+
 	def getOutliersWithZscore(self, ds, zthreshold, stats=None):
 		"""
-		gets outliers using zscore
+		gets outliers using zscore. For 2D data outliers are found for each column
 		
 		Parameters
-			ds: data set name or list or numpy array
+			ds: data set name or list or numpy array, 1D or 2D
 			zthreshold : z score threshold
-			stats : tuple cintaining mean and std dev
+			stats : tuple cintaining mean and std dev, arrays of column means and std devs for 2D data
 		"""
 		self.__printBanner("getting outliers using zscore", ds)
-		data = self.getNumericData(ds)
+		data = self.__getNumericArray(ds)
 		if stats is None:
-			mean = data.mean()
-			sd = np.std(data)
+			mean = data.mean(axis=0)
+			sd = np.std(data, axis=0)
 		else:
-			mean = stats[0]
-			sd = stats[1]
+			mean = np.asarray(stats[0])
+			sd = np.asarray(stats[1])
 			
-		zs = list(map(lambda d : abs((d - mean) / sd), data))
-		outliers = list(filter(lambda r : r[1] > zthreshold, enumerate(zs)))
+		zs = np.abs((data - mean) / sd)
+		if zs.ndim == 1:
+			outliers = self.__zscoreOutliers(zs, zthreshold)
+		else:
+			outliers = list(map(lambda c : self.__zscoreOutliers(zs[:, c], zthreshold), range(zs.shape[1])))
 		result = self.__printResult("outliers", outliers)	
 		return result
 
+	def __getNumericArray(self, ds):
+		"""
+		get numeric data, list data being 1D or nested 2D
+		
+		Parameters
+			ds : data set name or list or numpy array with data
+		"""
+		if type(ds) == list:
+			data = np.asarray(ds)
+			assert data.dtype.kind in "iuf", "data is not numeric"
+		else:
+			data = self.getNumericData(ds)
+		return data
+
+	def __zscoreOutliers(self, zs, zthreshold):
+		"""
+		gets index and zscore for zscores above threshold
+		
+		Parameters
+			zs : zscore array
+			zthreshold : z score threshold
+		"""
+		indexes = np.nonzero(zs > zthreshold)[0]
+		return list(zip(indexes.tolist(), zs[indexes].tolist()))
+
+	def getBasicStats(self, ds):
+		"""
+		gets mean, std dev, max and min. For 2D data stats are for each column
+		
+		Parameters
+			ds: data set name or list or numpy array, 1D or 2D
+		"""
+		self.__printBanner("getting basic stats", ds)
+		data = self.__getNumericArray(ds)
+		st = self.__getBasicStats(data)
+		result = self.__printResult("mean", st[0], "std dev", st[1], "max", st[2], "min", st[3])
+		return result
+
 	def getSubsequenceOutliersWithDissimilarity(self, subSeqSize, ds):
 		"""
 		gets subsequence outlier with subsequence pairwise disimilarity
@@ -1619,9 +2031,46 @@ class DataExplorer:
 				if d > dmax:
 					dmax = d
 					offset = k
-		result = self.__printResult("subSeqOffset", offset, "outlierScore", dmax)	
+		result = self.__printResult("subSeqOffset", offset, "outlierScore", dmax)
 		return result
-	
+
+	def getSubsequenceOutliersWithMatrixProfile(self, subSeqSize, ds, topk=1, znorm=False, njobs=1):
+		"""
+		gets subsequence outliers (discords) and motifs with matrix profile, computed with sliding
+		dot products (STOMP) in linear memory
+
+		Parameters
+			subSeqSize : sub sequence size
+			ds: data set name or list or numpy array
+			topk : num of discords and motifs to return
+			znorm : True for z normalized euclidean distance, False for euclidean distance
+			njobs : num of worker processes
+		"""
+		self.__printBanner("doing sub sequence anomaly detection with matrix profile", ds)
+		data = self.getNumericData(ds).astype(np.float64)
+		sz = len(data)
+		assertGreater(sz, 2 * subSeqSize, "data size should be more than twice the sub sequence size")
+		assertGreater(njobs, 0, "num of jobs should be positive")
+		nwin = sz - subSeqSize + 1
+
+		if njobs == 1:
+			mprof, mind = matrixProfileRows(data, subSeqSize, 0, nwin, znorm)
+		else:
+			bsize = int(nwin / njobs) + 1
+			ranges = list(map(lambda b : (b, min(b + bsize, nwin)), range(0, nwin, bsize)))
+			with ProcessPoolExecutor(max_workers=njobs) as executor:
+				futures = list(map(lambda r : executor.submit(matrixProfileRows, data, subSeqSize, r[0], r[1], znorm), ranges))
+				parts = list(map(lambda f : f.result(), futures))
+			mprof = np.concatenate(list(map(lambda p : p[0], parts)))
+			mind = np.concatenate(list(map(lambda p : p[1], parts)))
+
+		#discords with max of nearest neighbor distance and motifs with min
+		discords = list(map(lambda i : (i, mprof[i]), topNonOverlapping(mprof, topk, subSeqSize, True)))
+		motifs = list(map(lambda i : (i, mind[i], mprof[i]), topNonOverlapping(mprof, topk, subSeqSize, False, mind)))
+		result = self.__printResult("subSeqOffset", discords[0][0], "outlierScore", discords[0][1], "discords", discords,
+		"motifs", motifs, "matrixProfile", mprof, "profileIndex", mind)
+		return result
+
 	def getNullCount(self, ds):
 		"""
 		get count of null fields
@@ -1630,6 +2079,12 @@ class DataExplorer:
 			ds : data set name or list or numpy array with data
 		"""
 		self.__printBanner("getting null value count", ds)
+		cs = self.__getSummary(ds)
+		if cs is not None:
+			nullCount = cs.nullCount
+			nullFraction = nullCount / (cs.count + cs.nullCount)
+			result = self.__printResult("nullFraction", nullFraction, "nullCount", nullCount)
+			return result
 		if type(ds) == str:
 			assert ds in self.dataSets, "data set {} does not exist, please add it first".format(ds)
 			data =  self.dataSets[ds]
@@ -1826,6 +2281,72 @@ class DataExplorer:
 		self.__printStat(stat, pvalue, "probably uncorrelated", "probably correlated", sigLev)
 		return result
 
+	def getCorrMatrix(self, dsl, method="pearson", blockSize=1024, njobs=1):
+		"""
+		gets correlation coefficient and p value matrices for all pairs of data sets. Pearson and spearman
+		are computed block wise with matrix products, spearman with each data set ranked once. Point biserial 
+		is same as pearson with binary data. Kendall is computed pairwise
+		
+		Parameters
+			dsl: list of data set name or list or numpy array
+			method : pearson, spearman, kendall or pointbiserial
+			blockSize : num of data sets in a block
+			njobs : num of workers
+		"""
+		self.__printBanner("getting correlation matrix", *dsl)
+		assertInList(method, ["pearson", "spearman", "kendall", "pointbiserial"], "invalid correlation method")
+		dmat = self.__stackData(*dsl).astype(np.float64)
+		nrow, ncol = dmat.shape
+		assertGreater(nrow, 2, "need more than 2 samples")
+		
+		if method == "kendall":
+			pairs = [(i, j) for i in range(ncol) for j in range(i + 1, ncol)]
+			if njobs == 1:
+				res = kendallPairs(dmat, pairs)
+			else:
+				psize = int(len(pairs) / njobs) + 1
+				with ProcessPoolExecutor(max_workers=njobs) as executor:
+					parts = executor.map(kendallPairs, [dmat] * njobs, [pairs[b:b+psize] for b in range(0, len(pairs), psize)])
+					res = [r for part in parts for r in part]
+			corr = np.eye(ncol)
+			pvalue = np.zeros((ncol, ncol))
+			for (i, j), (c, pv) in zip(pairs, res):
+				corr[i, j] = corr[j, i] = c
+				pvalue[i, j] = pvalue[j, i] = pv
+		else:
+			if method == "spearman":
+				dmat = sta.rankdata(dmat, axis=0)
+			
+			#standardize so that correlation is matrix product
+			dmat = dmat - dmat.mean(axis=0)
+			norms = np.sqrt((dmat * dmat).sum(axis=0))
+			norms[norms == 0] = np.nan
+			dmat = dmat / norms
+			blocks = [(r, c) for r in range(0, ncol, blockSize) for c in range(r, ncol, blockSize)]
+			corr = np.empty((ncol, ncol))
+			def corrBlock(b):
+				r, c = b
+				corr[r:r+blockSize, c:c+blockSize] = dmat[:, r:r+blockSize].T @ dmat[:, c:c+blockSize]
+				corr[c:c+blockSize, r:r+blockSize] = corr[r:r+blockSize, c:c+blockSize].T
+			if njobs == 1:
+				for b in blocks:
+					corrBlock(b)
+			else:
+				#matrix product releases GIL
+				with ThreadPoolExecutor(max_workers=njobs) as executor:
+					list(executor.map(corrBlock, blocks))
+			np.clip(corr, -1.0, 1.0, out=corr)
+			np.fill_diagonal(corr, 1.0)
+			
+			#two sided p value with t distribution
+			dof = nrow - 2
+			with np.errstate(divide="ignore", invalid="ignore"):
+				tstat = corr * np.sqrt(dof / ((1.0 - corr) * (1.0 + corr)))
+			pvalue = 2 * sta.t.sf(np.abs(tstat), dof)
+			
+		result = self.__printResult("corr", corr, "pvalue", pvalue)
+		return result
+
 	def getConTab(self, ds1, ds2):
 		"""
 		get contingency table for categorical data pair
@@ -1968,7 +2489,7 @@ class DataExplorer:
 		result = self.__printResult("hurstExponent", h, "hurstConstant", c)
 		return result
 		
-	def approxEntropy(self, ds, m, r):
+	def approxEntropy(self, ds, m, r, blockSize=4194304):
 		"""
 		gets apprx entroty of time series (ref: wikipedia)
 		
@@ -1976,14 +2497,15 @@ class DataExplorer:
 			ds: data set name or list or numpy array
 			m:  length of compared run of data
 			r: filtering level
+			blockSize : max num of pairwise distances held in memory at a time
 		"""
 		self.__printBanner("getting approximate entropy", ds)
 		ldata = self.getNumericData(ds)
-		aent = abs(self.__phi(ldata, m + 1, r) - self.__phi(ldata, m, r))
+		aent = abs(self.__phi(ldata, m + 1, r, blockSize) - self.__phi(ldata, m, r, blockSize))
 		result = self.__printResult("approxEntropy", aent)
 		return result
 		
-	def __phi(self, ldata, m, r):
+	def __phi(self, ldata, m, r, blockSize):
 		"""
 		phi function for approximate entropy
 		
@@ -1991,19 +2513,59 @@ class DataExplorer:
 			ldata: data array
 			m:  length of compared run of data
 			r: filtering level
+			blockSize : max num of pairwise distances held in memory at a time
 		"""
 		le = len(ldata)
-		x = [[ldata[j] for j in range(i, i + m - 1 + 1)] for i in range(le - m + 1)]
-		lex = len(x)
-		c = list()
-		for i in range(lex):
-			cnt = 0
-			for j in range(lex):
-				cnt += (1 if maxListDist(x[i], x[j]) <= r else 0)
-			cnt /= (le - m + 1.0)
-			c.append(cnt)
-		return sum(np.log(c)) / (le - m + 1.0)
+		nwin = le - m + 1
+		c = self.__matchCounts(ldata, m, r, nwin, True, blockSize) / (le - m + 1.0)
+		return np.log(c).sum() / (le - m + 1.0)
+
+	def sampleEntropy(self, ds, m, r, blockSize=4194304):
+		"""
+		gets sample entropy of time series, without self matches (ref: wikipedia)
+		
+		Parameters
+			ds: data set name or list or numpy array
+			m:  length of compared run of data
+			r: filtering level
+			blockSize : max num of pairwise distances held in memory at a time
+		"""
+		self.__printBanner("getting sample entropy", ds)
+		ldata = self.getNumericData(ds)
+		nwin = len(ldata) - m
+		assertGreater(nwin, 1, "data size too small for the run length")
+		b = self.__matchCounts(ldata, m, r, nwin, False, blockSize).sum() / 2
+		a = self.__matchCounts(ldata, m + 1, r, nwin, False, blockSize).sum() / 2
+		sent = -log(a / b) if a > 0 and b > 0 else inf
+		result = self.__printResult("sampleEntropy", sent, "numMatchLong", a, "numMatchShort", b)
+		return result
+
+	def __matchCounts(self, ldata, m, r, nwin, selfMatch, blockSize):
+		"""
+		for each of the first nwin windows, count of windows within chebyshev distance r.
+		Processed in blocks of rows to bound memory
 		
+		Parameters
+			ldata: data array
+			m:  length of compared run of data
+			r: filtering level
+			nwin : num of windows to compare
+			selfMatch : True if a window matching itself is counted
+			blockSize : max num of pairwise distances held in memory at a time
+		"""
+		data = np.asarray(ldata, dtype=np.float64)
+		win = np.lib.stride_tricks.sliding_window_view(data, m)[:nwin]
+		bsize = max(int(blockSize / nwin), 1)
+		counts = np.empty(nwin)
+		for beg in range(0, nwin, bsize):
+			end = min(beg + bsize, nwin)
+			dist = np.abs(win[beg:end, 0][:, np.newaxis] - win[:, 0])
+			for k in range(1, m):
+				np.maximum(dist, np.abs(win[beg:end, k][:, np.newaxis] - win[:, k]), out=dist)
+			counts[beg:end] = (dist <= r).sum(axis=1)
+		if not selfMatch:
+			counts -= 1
+		return counts
 
 	def oneSpaceEntropy(self, ds, scaMethod="zscale"):
 		"""
@@ -2609,6 +3171,37 @@ class DataExplorer:
 		result = self.__printResult("stat", stat)
 		return result
 
+	def testTwoSampleBatch(self, jobs, njobs=1, sigLev=.05):
+		"""
+		runs a batch of 2 sample tests in parallel, without per test output, returning a table of results.
+		Supported tests are student, ks, mw, wilcox, kw, es, anderson, scaleAb, scaleMood, varBartlet, 
+		varLevene, varFk, medMood, cvm and wasserstein
+		
+		Parameters
+			jobs : list of tuples of test name, first data set and second data set, each data set being name or list or numpy array
+			njobs : num of worker processes
+			sigLev: statistical significance level
+		"""
+		self.__printBanner("doing batch of 2 sample tests")
+		tests = list(map(lambda j : j[0], jobs))
+		for t in tests:
+			assertInList(t, twoSampleTests, "invalid 2 sample test " + t)
+		data1 = list(map(lambda j : self.getNumericData(j[1]), jobs))
+		data2 = list(map(lambda j : self.getNumericData(j[2]), jobs))
+		if njobs == 1:
+			res = list(map(twoSampleTest, tests, data1, data2))
+		else:
+			with ProcessPoolExecutor(max_workers=njobs) as executor:
+				res = list(executor.map(twoSampleTest, tests, data1, data2, chunksize=max(int(len(jobs) / (4 * njobs)), 1)))
+		
+		tags = list(map(lambda ds : ds if type(ds) == str else "annoynymous", [d for j in jobs for d in j[1:3]]))
+		table = pd.DataFrame({"test" : tests, "ds1" : tags[0::2], "ds2" : tags[1::2], 
+		"stat" : list(map(lambda r : r[0], res)), "pvalue" : list(map(lambda r : r[1], res))})
+		table["nullHypAccepted"] = list(map(lambda r : None if isnan(r[1]) else r[1] > sigLev, res))
+		if self.verbose:
+			print(table.to_string())
+		return table
+
 	def ensureSameSize(self, dlist):
 		"""
 		ensures all data sets are of same size
@@ -2642,7 +3235,7 @@ class DataExplorer:
 		result = self.__printResult("stat", stat, "normalizedStat", nstat)
 		return result
 	
-	def getMaxRelMinRedFeatures(self, fdst, tdst, nfeatures, nbins=20):
+	def getMaxRelMinRedFeatures(self, fdst, tdst, nfeatures, nbins=20, njobs=1):
 		"""
 		get top n features based on max relevance and min redudancy	algorithm
 		
@@ -2651,11 +3244,12 @@ class DataExplorer:
 			tdst: target data set name or list or numpy array and data type (cat for classification num for regression)
 			nfeatures : desired no of features
 			nbins : no of bins for numerical data
+			njobs : num of worker processes for mutual information
 		"""	
 		self.__printBanner("doing max relevance min redundancy feature selection")
-		return self.getMutInfoFeatures(fdst, tdst, nfeatures, "mrmr", nbins)	
+		return self.getMutInfoFeatures(fdst, tdst, nfeatures, "mrmr", nbins, njobs)	
 
-	def getJointMutInfoFeatures(self, fdst, tdst, nfeatures, nbins=20):
+	def getJointMutInfoFeatures(self, fdst, tdst, nfeatures, nbins=20, njobs=1):
 		"""
 		get top n features based on joint mutual infoormation	algorithm
 		
@@ -2664,11 +3258,12 @@ class DataExplorer:
 			tdst: target data set name or list or numpy array and data type (cat for classification num for regression)
 			nfeatures : desired no of features
 			nbins : no of bins for numerical data
+			njobs : num of worker processes for mutual information
 		"""	
 		self.__printBanner("doingjoint mutual info feature selection")
-		return self.getMutInfoFeatures(fdst, tdst, nfeatures, "jmi", nbins)
+		return self.getMutInfoFeatures(fdst, tdst, nfeatures, "jmi", nbins, njobs)
 		
-	def getCondMutInfoMaxFeatures(self, fdst, tdst, nfeatures, nbins=20):
+	def getCondMutInfoMaxFeatures(self, fdst, tdst, nfeatures, nbins=20, njobs=1):
 		"""
 		get top n features based on condition mutual information maximization algorithm
 		
@@ -2677,11 +3272,12 @@ class DataExplorer:
 			tdst: target data set name or list or numpy array and data type (cat for classification num for regression)
 			nfeatures : desired no of features
 			nbins : no of bins for numerical data
+			njobs : num of worker processes for mutual information
 		"""	
 		self.__printBanner("doing conditional mutual info max feature selection")
-		return self.getMutInfoFeatures(fdst, tdst, nfeatures, "cmim", nbins)
+		return self.getMutInfoFeatures(fdst, tdst, nfeatures, "cmim", nbins, njobs)
 
-	def getInteractCapFeatures(self, fdst, tdst, nfeatures, nbins=20):
+	def getInteractCapFeatures(self, fdst, tdst, nfeatures, nbins=20, njobs=1):
 		"""
 		get top n features based on interaction capping algorithm
 		
@@ -2690,15 +3286,19 @@ class DataExplorer:
 			tdst: target data set name or list or numpy array and data type (cat for classification num for regression)
 			nfeatures : desired no of features
 			nbins : no of bins for numerical data
+			njobs : num of worker processes for mutual information
 		"""	
 		self.__printBanner("doing interaction capped feature selection")
-		return self.getMutInfoFeatures(fdst, tdst, nfeatures, "icap", nbins)
+		return self.getMutInfoFeatures(fdst, tdst, nfeatures, "icap", nbins, njobs)
 
-	def getMutInfoFeatures(self, fdst, tdst, nfeatures, algo, nbins=20):
+	def getMutInfoFeatures(self, fdst, tdst, nfeatures, algo, nbins=20, njobs=1):
 		"""
 		get top n features based on various mutual information	based algorithm
 		ref: Conditional ikelihood maximisation : A unifying framework for information 
-		theoretic feature selection, Gavin Brown
+		theoretic feature selection, Gavin Brown. Relevance and redundancy terms are read from the 
+		matrices computed once by getMutInfoMatrix, with each data set binned once over its whole range.
+		These are not the per group binned estimates of getMutualInfo and getCondMutualInfo, which this 
+		used earlier, so scores and selected features are different from those earlier results
 		
 		Parameters
 			fdst: list of pair of data set name or list or numpy array and data type
@@ -2706,80 +3306,133 @@ class DataExplorer:
 			nfeatures : desired no of features
 			algo: mi based feature selection algorithm
 			nbins : no of bins for numerical data
+			njobs : num of worker processes for mutual information matrix
 		"""	
-		#verify data source types types
-		le = len(fdst)
-		nfeatGiven = int(le / 2)
-		assertGreater(nfeatGiven, nfeatures, "no of features should be greater than no of features to be selected")
-		fds = list()
-		types = ["num", "cat"]
-		for i in range (0, le, 2):
-			ds = fdst[i]
-			dt = fdst[i+1]
-			assertInList(dt, types, "invalid type for data source " + dt)
-			data = self.getNumericData(ds) if dt == "num" else self.getCatData(ds)
-			p =(ds, dt)
-			fds.append(p)
 		algos = ["mrmr", "jmi", "cmim", "icap"]
 		assertInList(algo, algos, "invalid feature selection algo " + algo)
-		
-		assertInList(tdst[1], types, "invalid type for data source " + tdst[1])
-		data = self.getNumericData(tdst[0]) if tdst[1] == "num" else self.getCatData(tdst[0])
-		#print(fds)
+		nfeatGiven = int(len(fdst) / 2)
+		assertGreater(nfeatGiven, nfeatures, "no of features should be greater than no of features to be selected")
+		ve = self.verbose 
+		self.verbose = False
+		mim = self.getMutInfoMatrix(fdst, tdst, nbins, njobs)
+		self.verbose = ve
+		fnames = mim["features"]
+		relevancies = mim["relevance"]
+		mutInfo = mim["mutInfo"]
+		condMutInfo = mim["condMutInfo"]
 		
 		sfds = list()
-		selected = set()
-		relevancies = dict()
+		selected = list()
+		remaining = np.ones(nfeatGiven, dtype=bool)
 		for i in range(nfeatures):
-			#print(i)
-			scorem = None
-			dsm = None
-			dsmt = None
-			for ds, dt in fds:
-				#print(ds, dt)
-				if ds not in selected:
-					#relevancy
-					if ds in relevancies:
-						mutInfo = relevancies[ds]
-					else:
-						mutInfo = self.getMutualInfo([ds, dt,  tdst[0], tdst[1]], nbins)["mutInfo"]
-						relevancies[ds] = mutInfo
-					relev = mutInfo
-					#print("relev", relev)
-					
-					#redundancy
-					smi = 0
-					reds = list()
-					for sds, sdt, _ in sfds:
-						#print(sds, sdt)
-						mutInfo = self.getMutualInfo([ds, dt,  sds, sdt], nbins)["mutInfo"]
-						mutInfoCnd = self.getCondMutualInfo([ds, dt,  sds, sdt, tdst[0], tdst[1]], nbins)["condMutInfo"] \
-						if algo != "mrmr" else 0
-						
-						red = mutInfo - mutInfoCnd
-						reds.append(red)	
-						
-					if algo == "mrmr" or algo == "jmi":
-						redun = sum(reds) / len(sfds) if len(sfds) > 0 else 0
-					elif algo == "cmim" or algo == "icap":
-						redun = max(reds) if len(sfds) > 0 else 0
-						if algo == "icap":
-							redun = max(0, redun)
-					#print("redun", redun)
-					score = relev - redun
-					if scorem is None or score > scorem:
-						scorem = score
-						dsm = ds
-						dsmt = dt
-						
-			pa = (dsm, dsmt, scorem)
-			#print(pa)
-			sfds.append(pa)
-			selected.add(dsm)
+			cand = np.nonzero(remaining)[0]
+			if len(selected) > 0:
+				#redundancy
+				reds = mutInfo[np.ix_(cand, selected)]
+				if algo != "mrmr":
+					reds = reds - condMutInfo[np.ix_(cand, selected)]
+				if algo == "mrmr" or algo == "jmi":
+					redun = reds.mean(axis=1)
+				else:
+					redun = reds.max(axis=1)
+					if algo == "icap":
+						redun = np.maximum(redun, 0)
+			else:
+				redun = 0
+			scores = relevancies[cand] - redun
+			best = np.argmax(scores)
+			fi = cand[best]
+			sfds.append((fnames[fi], float(scores[best])))
+			selected.append(fi)
+			remaining[fi] = False
 			
-		selFeatures = list(map(lambda r : (r[0], r[2]), sfds))
-		result = self.__printResult("selFeatures", selFeatures)
+		result = self.__printResult("selFeatures", sfds)
 		return result
+
+	def getMutInfoMatrix(self, fdst, tdst=None, nbins=20, njobs=1):
+		"""
+		gets pairwise mutual information matrix among features and optionally relevance to a target and 
+		pairwise mutual information conditioned on the target, from joint histograms of data discretized
+		once with global bins by getDiscretizedData. This plug in estimate differs from getMutualInfo and
+		getCondMutualInfo, which bin each group separately. Used by the feature selection algorithms
+		
+		Parameters
+			fdst: list of pair of data set name or list or numpy array and data type
+			tdst: target data set name or list or numpy array and data type (cat for classification num for regression)
+			nbins : no of bins for numerical data
+			njobs : num of worker processes
+		"""	
+		self.__printBanner("getting mutual information matrix")
+		types = ["num", "cat"]
+		fnames = list()
+		codes = list()
+		for i in range (0, len(fdst), 2):
+			assertInList(fdst[i+1], types, "invalid type for data source " + str(fdst[i+1]))
+			fnames.append(fdst[i])
+			codes.append(self.getDiscretizedData(fdst[i], fdst[i+1], nbins))
+		self.ensureSameSize(codes)
+		nfeat = len(codes)
+		ncodes = np.array(list(map(lambda c : c.max() + 1, codes)), dtype=np.int64)
+		codes = np.column_stack(codes)
+		
+		tcodes = None
+		ntcodes = 0
+		if tdst is not None:
+			assertInList(tdst[1], types, "invalid type for data source " + str(tdst[1]))
+			tcodes = self.getDiscretizedData(tdst[0], tdst[1], nbins)
+			self.ensureSameSize([codes, tcodes])
+			ntcodes = tcodes.max() + 1
+
+		#one column of the matrices per task
+		cols = list(range(nfeat))
+		if njobs == 1:
+			parts = list(map(lambda c : mutInfoColumn(codes, ncodes, c, tcodes, ntcodes), cols))
+		else:
+			with ProcessPoolExecutor(max_workers=njobs) as executor:
+				parts = list(executor.map(mutInfoColumn, [codes] * nfeat, [ncodes] * nfeat, cols, 
+				[tcodes] * nfeat, [ntcodes] * nfeat, chunksize=max(int(nfeat / (4 * njobs)), 1)))
+		mutInfo = np.column_stack(list(map(lambda p : p[0], parts)))
+		
+		if tdst is not None:
+			condMutInfo = np.column_stack(list(map(lambda p : p[1], parts)))
+			relevance = mutInfoColumn(np.column_stack((codes, tcodes)), np.append(ncodes, ntcodes), nfeat)[0][:nfeat]
+		else:
+			condMutInfo = None
+			relevance = None
+		
+		ve = self.verbose 
+		self.verbose = False
+		result = self.__printResult("features", fnames, "mutInfo", mutInfo, "relevance", relevance, "condMutInfo", condMutInfo)
+		self.verbose = ve
+		return result
+
+	def getDiscretizedData(self, ds, dtype, nbins=20):
+		"""
+		gets data discretized to bin index for numeric data and value index for categorical data. Cached
+		for named data sets
+		
+		Parameters
+			ds: data set name or list or numpy array
+			dtype : data type num or cat
+			nbins : no of bins for numerical data
+		"""	
+		key = (ds, dtype, nbins) if type(ds) == str else None
+		if key in self.discCache:
+			return self.discCache[key]
+		
+		if dtype == "num":
+			data = self.getNumericData(ds).astype(np.float64)
+			xmin = data.min()
+			binWidth = (data.max() + .01 - (xmin - .01)) / nbins
+			codes = ((data - xmin) / binWidth).astype(np.int64)
+		else:
+			data = self.getCatData(ds)
+			_, codes = np.unique(np.array(data, dtype=str), return_inverse=True)
+			codes = codes.astype(np.int64)
+			
+		if key is not None:
+			self.discCache[key] = codes
+		return codes
 				
 	def __stackData(self, *dsl):
 		"""
@@ -2851,14 +3504,280 @@ class DataExplorer:
 		
 	def __getBasicStats(self, data):
 		"""
-		get mean and std dev
+		get mean, std dev, max and min, column wise for 2D data
 		
 		Parameters
 			data : numpy array
 		"""
-		mean = np.average(data)
-		sd = np.std(data)
-		r = (mean, sd, np.max(data), np.min(data))
+		mean = np.mean(data, axis=0)
+		sd = np.std(data, axis=0)
+		r = (mean, sd, np.max(data, axis=0), np.min(data, axis=0))
 		return r
 
+def slidingDotProduct(query, data):
+	"""
+	dot product of query with all sub sequences of data, with FFT
+
+	Parameters
+		query : query sub sequence
+		data : numpy array data
+	"""
+	n = len(data)
+	m = len(query)
+	fsize = 1 << (n + m - 1).bit_length()
+	prod = np.fft.irfft(np.fft.rfft(data, fsize) * np.fft.rfft(query[::-1], fsize), fsize)
+	return prod[m - 1 : n]
+
+def matrixProfileRows(data, subSeqSize, beg, end, znorm=False):
+	"""
+	matrix profile and profile index for a range of sub sequences with STOMP, each sub
+	sequence compared with all non overlapping sub sequences. Memory is linear in data size
+
+	Parameters
+		data : numpy array data
+		subSeqSize : sub sequence size
+		beg : first sub sequence offset
+		end : sub sequence offset past the last one
+		znorm : True for z normalized euclidean distance
+	"""
+	m = subSeqSize
+	n = len(data)
+	nwin = n - m + 1
+
+	#window sums and sums of squares
+	csum = np.concatenate(([0.0], np.cumsum(data)))
+	csumSq = np.concatenate(([0.0], np.cumsum(data * data)))
+	wsum = csum[m:] - csum[:-m]
+	wsumSq = csumSq[m:] - csumSq[:-m]
+	if znorm:
+		mean = wsum / m
+		sd = np.sqrt(np.maximum(wsumSq / m - mean * mean, 0))
+		sd[sd == 0] = np.finfo(np.float64).eps
+
+	#first column of dot products, to seed each row update
+	qtFirst = slidingDotProduct(data[:m], data)
+	qt = slidingDotProduct(data[beg : beg + m], data)
+	offsets = np.arange(nwin)
+	mprof = np.empty(end - beg)
+	mind = np.empty(end - beg, dtype=np.int64)
+	for i in range(beg, end):
+		if i > beg:
+			qt[1:] = qt[:-1] - data[i - 1] * data[:nwin - 1] + data[i + m - 1] * data[m:n]
+			qt[0] = qtFirst[i]
+		if znorm:
+			corr = (qt - m * mean[i] * mean) / (m * sd[i] * sd)
+			dsq = 2 * m * (1.0 - corr)
+		else:
+			dsq = wsumSq[i] + wsumSq - 2 * qt
+		dsq[np.abs(offsets - i) < m] = np.inf
+		j = np.argmin(dsq)
+		mprof[i - beg] = sqrt(max(dsq[j], 0))
+		mind[i - beg] = j
+	return (mprof, mind)
+
+def topNonOverlapping(mprof, topk, subSeqSize, largest, mind=None):
+	"""
+	offsets of top matrix profile values, skipping sub sequences overlapping with the ones
+	already selected
+
+	Parameters
+		mprof : matrix profile
+		topk : num of offsets to return
+		subSeqSize : sub sequence size
+		largest : True for largest values (discords), False for smallest (motifs)
+		mind : profile index, when provided neighbors of selected sub sequences are also skipped
+	"""
+	order = np.argsort(-mprof if largest else mprof, kind="stable")
+	excluded = np.zeros(len(mprof), dtype=bool)
+	selected = list()
+	for i in order:
+		if len(selected) == topk:
+			break
+		if excluded[i] or not np.isfinite(mprof[i]):
+			continue
+		selected.append(int(i))
+		excluded[max(i - subSeqSize + 1, 0) : i + subSeqSize] = True
+		if mind is not None:
+			j = mind[i]
+			excluded[max(j - subSeqSize + 1, 0) : j + subSeqSize] = True
+	return selected
+
+def catCodes(data):
+	"""
+	value indexes and list of distinct values for categorical data, values keeping their types. Returns
+	None for indexes when some value is not a plain scalar that can be stored as json
+
+	Parameters
+		data : list of categorical data
+	"""
+	vindex = dict()
+	vocab = list()
+	codes = np.empty(len(data), dtype=np.int64)
+	for i, v in enumerate(data):
+		if isinstance(v, np.generic):
+			v = v.item()
+		if not (v is None or type(v) in (str, int, float, bool)):
+			return (None, None)
+		key = (type(v), v)
+		c = vindex.get(key)
+		if c is None:
+			c = len(vocab)
+			vindex[key] = c
+			vocab.append(v)
+		codes[i] = c
+	return (codes, vocab)
+
+def countEntropy(counts):
+	"""
+	entropy for each row of count data
+
+	Parameters
+		counts : 2D or higher dimensional array of counts, first dimension being the row
+	"""
+	counts = counts.reshape(counts.shape[0], -1).astype(np.float64)
+	distr = counts / counts.sum(axis=1, keepdims=True)
+	plogp = np.where(distr > 0, distr * np.log(np.where(distr > 0, distr, 1)), 0)
+	return -plogp.sum(axis=1)
+
+def mutInfoColumn(codes, ncodes, col, tcodes=None, ntcodes=0, blockSize=4194304):
+	"""
+	mutual information of all discretized columns with one column, and optionally the same 
+	conditioned on a discretized target, from joint histograms sized by the pair's own num of discrete 
+	values. Columns are processed in blocks to bound memory, with a pair whose histogram does not fit in
+	a block counted sparsely
+
+	Parameters
+		codes : 2D array of discretized data
+		ncodes : num of discrete values for each column
+		col : column index
+		tcodes : discretized target data
+		ntcodes : num of discrete target values
+		blockSize : max num of array elements in a block
+	"""
+	nrow, ncol = codes.shape
+	ncodes = np.asarray(ncodes, dtype=np.int64)
+	cdata = codes[:, col]
+	ncc = int(ncodes[col])
+	sizes = ncodes * ncc * (ntcodes if tcodes is not None else 1)
+	mutInfo = np.empty(ncol)
+	condMutInfo = np.empty(ncol) if tcodes is not None else None
+	
+	#blocks of columns with histograms together within block size
+	blocks = list()
+	block = list()
+	bsize = 0
+	for j in range(ncol):
+		if sizes[j] > blockSize:
+			(mutInfo[j], cmi) = sparseMutInfo(codes[:, j], cdata, ncc, tcodes, ntcodes)
+			if tcodes is not None:
+				condMutInfo[j] = cmi
+			continue
+		if len(block) > 0 and (bsize + sizes[j] > blockSize or (len(block) + 1) * nrow > blockSize):
+			blocks.append(block)
+			block = list()
+			bsize = 0
+		block.append(j)
+		bsize += sizes[j]
+	if len(block) > 0:
+		blocks.append(block)
+	
+	entr = lambda c : countEntropy(c[np.newaxis])[0]
+	for block in blocks:
+		offsets = np.concatenate(([0], np.cumsum(sizes[block])))
+		jcodes = codes[:, block] * ncc + cdata[:, np.newaxis]
+		if tcodes is not None:
+			jcodes = jcodes * ntcodes + tcodes[:, np.newaxis]
+		jcodes += offsets[:-1]
+		hist = np.bincount(jcodes.ravel(), minlength=offsets[-1])
+		for k, j in enumerate(block):
+			joint = hist[offsets[k]:offsets[k+1]]
+			if tcodes is None:
+				joint = joint.reshape(ncodes[j], ncc)
+			else:
+				joint = joint.reshape(ncodes[j], ncc, ntcodes)
+				condMutInfo[j] = entr(joint.sum(axis=1)) + entr(joint.sum(axis=0)) - entr(joint) - entr(joint.sum(axis=(0,1)))
+				joint = joint.sum(axis=2)
+			mutInfo[j] = entr(joint.sum(axis=1)) + entr(joint.sum(axis=0)) - entr(joint)
+	return (mutInfo, condMutInfo)
+
+def sparseMutInfo(acodes, bcodes, nbcodes, tcodes=None, ntcodes=0):
+	"""
+	mutual information of two discretized columns, and optionally the same conditioned on a discretized
+	target, from counts of the joint values present, with memory linear in data size
+
+	Parameters
+		acodes : first discretized data
+		bcodes : second discretized data
+		nbcodes : num of discrete values for second data
+		tcodes : discretized target data
+		ntcodes : num of discrete target values
+	"""
+	entr = lambda c : countEntropy(np.unique(c, return_counts=True)[1][np.newaxis])[0]
+	abcodes = acodes * nbcodes + bcodes
+	mutInfo = entr(acodes) + entr(bcodes) - entr(abcodes)
+	condMutInfo = None
+	if tcodes is not None:
+		condMutInfo = entr(acodes * ntcodes + tcodes) + entr(bcodes * ntcodes + tcodes) - \
+		entr(abcodes * ntcodes + tcodes) - entr(tcodes)
+	return (mutInfo, condMutInfo)
+
+def kendallPairs(dmat, pairs):
+	"""
+	kendall correlation and p value for column pairs
 
+	Parameters
+		dmat : 2D array data
+		pairs : list of column index pairs
+	"""
+	return list(map(lambda p : tuple(sta.kendalltau(dmat[:, p[0]], dmat[:, p[1]])), pairs))
+
+twoSampleTests = ["student", "ks", "mw", "wilcox", "kw", "es", "anderson", "scaleAb", "scaleMood", "varBartlet", 
+"varLevene", "varFk", "medMood", "cvm", "wasserstein"]
+
+def twoSampleTest(test, data1, data2):
+	"""
+	2 sample test returning stat and p value, p value being nan when not available. For anderson
+	p value is the approximate significance level and for wasserstein stat is normalized by std dev
+
+	Parameters
+		test : test name
+		data1 : first numpy array data
+		data2 : second numpy array data
+	"""
+	pvalue = np.nan
+	if test == "student":
+		stat, pvalue = sta.ttest_ind(data1, data2)
+	elif test == "ks":
+		stat, pvalue = sta.ks_2samp(data1, data2)
+	elif test == "mw":
+		stat, pvalue = sta.mannwhitneyu(data1, data2)
+	elif test == "wilcox":
+		stat, pvalue = sta.wilcoxon(data1, data2)
+	elif test == "kw":
+		stat, pvalue = sta.kruskal(data1, data2)
+	elif test == "es":
+		stat, pvalue = sta.epps_singleton_2samp(data1, data2)
+	elif test == "anderson":
+		stat, _, pvalue = sta.anderson_ksamp((data1, data2))
+	elif test == "scaleAb":
+		stat, pvalue = sta.ansari(data1, data2)
+	elif test == "scaleMood":
+		stat, pvalue = sta.mood(data1, data2)
+	elif test == "varBartlet":
+		stat, pvalue = sta.bartlett(data1, data2)
+	elif test == "varLevene":
+		stat, pvalue = sta.levene(data1, data2)
+	elif test == "varFk":
+		stat, pvalue = sta.fligner(data1, data2)
+	elif test == "medMood":
+		stat, pvalue, _, _ = sta.median_test(data1, data2)
+	elif test == "cvm":
+		re = sta.cramervonmises_2samp(data1, data2)
+		stat, pvalue = re.statistic, re.pvalue
+	elif test == "wasserstein":
+		stat = sta.wasserstein_distance(data1, data2) / np.std(np.concatenate([data1, data2]))
+	else:
+		raise ValueError("invalid 2 sample test " + test)
+	return (float(stat), float(pvalue))
+
+__all__ = moduleExports(globals())
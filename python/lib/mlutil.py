@@ -19,19 +19,176 @@
 import os
 import sys
 import numpy as np
-from sklearn import preprocessing
-from sklearn import metrics
-from sklearn.datasets import make_blobs
-from sklearn.datasets import make_classification
+import pandas as pd
+import io
+import itertools
+import glob
+import hashlib
+from types import MappingProxyType
 import random
 from math import *
 from decimal import Decimal
-import statistics
 import jprops
 from Levenshtein import distance as ld
 from util import *
 from sampler import *
 
+preprocessing = LazyImport("sklearn.preprocessing")
+metrics = LazyImport("sklearn.metrics")
+make_blobs = LazyImport("sklearn.datasets", "make_blobs")
+make_classification = LazyImport("sklearn.datasets", "make_classification")
+sparse = LazyImport("scipy.sparse")
+cdist = LazyImport("scipy.spatial.distance", "cdist")
+rfprocess = LazyImport("rapidfuzz.process")
+rflevenshtein = LazyImport("rapidfuzz.distance", "Levenshtein")
+
+dataCacheConfig = {"enabled" : True, "cacheDir" : None}
+dataCacheVersion = 1
+
+class ConfigSnapshot:
+	"""
+	immutable typed snapshot of configuration with every value parsed once, as by the typed getters of
+	Configuration. Type comes from the default value or is declared, otherwise value is kept as string. 
+	Values are accessed by param name as snap["train.num.iterations"] or as attribute with dots replaced
+	by under scores as snap.train_num_iterations
+	"""
+	paramTypes = ["string", "int", "float", "bool", "intList", "floatList", "stringList"]
+
+	def __init__(self, configs, defValues, types=None):
+		"""
+		initializer
+		
+		Parameters
+			configs : dictionary of raw config values
+			defValues : dictionary of default values
+			types : dictionary of param name to type, one of string, int, float, bool, intList, floatList
+				and stringList, for params whose default does not tell the type
+		"""
+		types = dict() if types is None else types
+		for name, dtype in types.items():
+			assertInList(dtype, ConfigSnapshot.paramTypes, "invalid config param type " + str(dtype) + " for " + name)
+		values = dict()
+		missing = dict()
+		for name in set(configs.keys()) | set(defValues.keys()):
+			dVal = defValues.get(name)
+			raw = configs.get(name, "_")
+			if raw.lower() == "none":
+				values[name] = None
+			elif raw == "_":
+				if dVal is None:
+					missing[name] = "missing config param " + name
+				elif dVal[1] is not None:
+					missing[name] = dVal[1]
+				else:
+					values[name] = tuple(dVal[0]) if type(dVal[0]) == list else dVal[0]
+			elif name in types:
+				values[name] = ConfigSnapshot.parseAs(raw, types[name])
+			else:
+				values[name] = ConfigSnapshot.parse(raw, dVal[0] if dVal is not None else None)
+		aliases = dict(map(lambda k : (k.replace(".", "_"), k), values.keys() | missing.keys()))
+		object.__setattr__(self, "values", MappingProxyType(values))
+		object.__setattr__(self, "missing", MappingProxyType(missing))
+		object.__setattr__(self, "aliases", MappingProxyType(aliases))
+		
+		#values as instance attributes for plain attribute lookup
+		for alias, name in aliases.items():
+			if name in values and not hasattr(ConfigSnapshot, alias) and alias not in ("values", "missing", "aliases"):
+				object.__setattr__(self, alias, values[name])
+
+	@staticmethod
+	def parse(raw, default):
+		"""
+		parses raw value to the type of default value, kept as string when there is no default to tell
+		the type. Lists are returned as tuples
+		
+		Parameters
+			raw : raw string value
+			default : default value
+		"""
+		dtype = type(default)
+		if dtype == bool:
+			val = ConfigSnapshot.parseAs(raw, "bool")
+		elif dtype == int:
+			val = ConfigSnapshot.parseAs(raw, "int")
+		elif dtype == float:
+			val = ConfigSnapshot.parseAs(raw, "float")
+		elif dtype == list or dtype == tuple:
+			etype = type(default[0]) if len(default) > 0 else str
+			if etype == int:
+				val = ConfigSnapshot.parseAs(raw, "intList")
+			elif etype == float:
+				val = ConfigSnapshot.parseAs(raw, "floatList")
+			else:
+				val = ConfigSnapshot.parseAs(raw, "stringList")
+		else:
+			val = raw
+		return val
+
+	@staticmethod
+	def parseAs(raw, dtype):
+		"""
+		parses raw value as declared type, same as the corresponding typed getter of Configuration. 
+		Lists are returned as tuples
+		
+		Parameters
+			raw : raw string value
+			dtype : type, one of string, int, float, bool, intList, floatList and stringList
+		"""
+		if dtype == "int":
+			val = int(raw)
+		elif dtype == "float":
+			val = float(raw)
+		elif dtype == "bool":
+			val = raw.lower() == "true"
+		elif dtype == "intList":
+			val = tuple(strListOrRangeToIntArray(raw))
+		elif dtype == "floatList":
+			val = tuple(strToFloatArray(raw))
+		elif dtype == "stringList":
+			val = tuple(raw.split(","))
+		else:
+			val = raw
+		return val
+
+	def __getitem__(self, name):
+		"""
+		gets value
+		
+		Parameters
+			name : config param name
+		"""
+		if name in self.missing:
+			raise ValueError(self.missing[name])
+		return self.values[name]
+
+	def __getattr__(self, name):
+		"""
+		gets value with attribute name
+		
+		Parameters
+			name : config param name with dots replaced by under scores
+		"""
+		key = self.aliases.get(name)
+		if key is None:
+			raise AttributeError("no config param for " + name)
+		return self[key]
+
+	def __setattr__(self, name, value):
+		raise AttributeError("config snapshot is immutable")
+
+	def __delattr__(self, name):
+		raise AttributeError("config snapshot is immutable")
+
+	def __contains__(self, name):
+		return name in self.values or name in self.missing
+
+	def keys(self):
+		"""
+		config param names
+		"""
+		return list(self.values.keys() | self.missing.keys())
+
+
 class Configuration:
 	"""
 	Configuration management. Supports default value, mandatory value and typed value.
@@ -52,6 +209,8 @@ class Configuration:
 		self.configs = configs
 		self.defValues = defValues
 		self.verbose = verbose
+		self.snapshot = None
+		self.snapTypes = None
 
 	def override(self, configFile):
 		"""
@@ -63,6 +222,7 @@ class Configuration:
 		with open(configFile) as fp:
   			for key, value in jprops.iter_properties(fp):
   				self.configs[key] = value
+		self.snapshot = None
   			
 	
 	def setParam(self, name, value):
@@ -74,7 +234,34 @@ class Configuration:
 			value : config param value
 		"""
 		self.configs[name] = value
+		self.snapshot = None
 
+	def refresh(self, types=None):
+		"""
+		builds typed snapshot from current configuration
+		
+		Parameters
+			types : dictionary of param name to type for params whose default does not tell the type, 
+				types from earlier call used if None
+		"""
+		if types is not None:
+			self.snapTypes = types
+		self.snapshot = ConfigSnapshot(self.configs, self.defValues, self.snapTypes)
+		return self.snapshot
+
+	def getSnapshot(self, types=None):
+		"""
+		gets typed snapshot, built on first call, after setParam or override and when param types 
+		change. A snapshot already obtained does not change. Params without typed default or declared 
+		type are kept as string
+		
+		Parameters
+			types : dictionary of param name to type, one of string, int, float, bool, intList, floatList
+				and stringList, for params whose default does not tell the type
+		"""
+		if self.snapshot is None or (types is not None and types != self.snapTypes):
+			self.refresh(types)
+		return self.snapshot
 	
 	def getStringConfig(self, name):
 		"""
@@ -304,10 +491,12 @@ class CatLabelGenerator:
 		self.encoders = {}
 		self.catValues = catValues
 		self.delim = delim
+		self.labels = {}
 		for k in self.catValues.keys():	
 			le = preprocessing.LabelEncoder()	
 			le.fit(self.catValues[k])
 			self.encoders[k] = le
+			self.labels[k] = dict(map(lambda c : (c[1], c[0]), enumerate(le.classes_.tolist())))
 
 	def processRow(self, row):	
 		"""
@@ -321,11 +510,59 @@ class CatLabelGenerator:
 		for i in range(len(rowArr)):
 			if (i in self.catValues):
 				curVal = rowArr[i]
-				assert curVal in self.catValues[i], "categorival value invalid"
-				encVal = self.encoders[i].transform([curVal])
-				rowArr[i] = str(encVal[0])
+				assert curVal in self.labels[i], "categorival value invalid"
+				rowArr[i] = str(self.labels[i][curVal])
 		return self.delim.join(rowArr)		
 
+	def __encodeColumns(self, rows):
+		"""
+		parses chunk of rows and encodes categorical columns, returns data frame
+		
+		Parameters:
+			rows : list of delemeter separated rows
+		"""
+		text = "\n".join(map(lambda r : r.rstrip("\n"), rows))
+		df = pd.read_csv(io.StringIO(text), sep=self.delim, header=None, dtype=str, na_filter=False, 
+		quoting=3, engine="c" if len(self.delim) == 1 else "python")
+		for i, labels in self.labels.items():
+			codes, uniq = pd.factorize(df[i])
+			ulabels = list(map(lambda u : labels.get(u, -1), uniq))
+			assert -1 not in ulabels, "categorival value invalid"
+			df[i] = np.array(ulabels, dtype=np.int64)[codes]
+		return df
+
+	def encodeBatch(self, rows, dtype=np.float64):
+		"""
+		encodes chunk of rows into numeric matrix, non categorical columns must be numeric
+		
+		Parameters:
+			rows : list of delemeter separated rows
+			dtype : matrix data type
+		"""
+		return self.__encodeColumns(rows).to_numpy(dtype=dtype)
+
+	def encodeFile(self, inFilePath, outFilePath=None, chunkSize=100000):
+		"""
+		streaming encoding of file in chunks of rows
+		
+		Parameters:
+			inFilePath : input file path
+			outFilePath : output file path, standard output if None
+			chunkSize : number of rows in a chunk
+		"""
+		with openTextFile(inFilePath) as fp:
+			ofp = open(outFilePath, "w") if outFilePath is not None else sys.stdout
+			try:
+				while True:
+					rows = list(itertools.islice(fp, chunkSize))
+					if len(rows) == 0:
+						break
+					df = self.__encodeColumns(rows)
+					ofp.write(df.to_csv(sep=self.delim, header=False, index=False, quoting=3, lineterminator="\n"))
+			finally:
+				if outFilePath is not None:
+					ofp.close()
+
 	def getOrigLabels(self, indx):
 		"""
 		get original labels
@@ -461,7 +698,75 @@ class SupvLearningDataGenerator:
 
 
 
-def loadDataFile(file, delim, cols, colIndices):
+def setDataCacheConfig(enabled=None, cacheDir=None):
+	"""
+	sets parsed data file cache flag and location used by data file loaders
+	
+	Parameters
+		enabled : True if parsed data is cached
+		cacheDir : cache directory, by default datacache under user cache directory
+	"""
+	if enabled is not None:
+		dataCacheConfig["enabled"] = enabled
+	if cacheDir is not None:
+		dataCacheConfig["cacheDir"] = cacheDir
+
+def __dataCachePath(file, delim, cols):
+	"""
+	cache file path prefix for column selection and full path for current file state
+	
+	Parameters
+		file : file path
+		delim : delemeter
+		cols : columns to use from file
+	"""
+	st = os.stat(file)
+	absPath = os.path.abspath(file)
+	cols = None if cols is None else list(cols) if isinstance(cols, (list, tuple, np.ndarray)) else cols
+	selKey = hashlib.sha1(repr((absPath, delim, cols)).encode()).hexdigest()[:16]
+	stateKey = hashlib.sha1(repr((dataCacheVersion, st.st_mtime_ns, st.st_size)).encode()).hexdigest()[:16]
+	cacheDir = dataCacheConfig["cacheDir"] if dataCacheConfig["cacheDir"] is not None else userCacheDir("datacache")
+	prefix = os.path.join(cacheDir, os.path.basename(absPath) + "." + selKey)
+	return (prefix, prefix + "-" + stateKey + ".npc.npy")
+
+def loadCachedDataFile(file, delim, cols, cache=None):
+	"""
+	loads delim separated file as array. Parsed array is cached in a .npy file keyed by path, modification
+	time, size, delimiter and columns, and memory mapped copy on write on later loads
+	
+	Parameters
+		file : file path
+		delim : delemeter
+		cols : columns to use from file
+		cache : True if parsed data is cached, by default as per cache config
+	"""
+	cache = dataCacheConfig["enabled"] if cache is None else cache
+	if cache:
+		(prefix, cachePath) = __dataCachePath(file, delim, cols)
+		if os.path.exists(cachePath):
+			try:
+				return np.load(cachePath, mmap_mode="c")
+			except (OSError, ValueError):
+				pass
+	
+	with openTextFile(file) as fp:
+		data = np.loadtxt(fp, delimiter=delim, usecols=cols)
+	
+	#stale caches for the same columns removed, atomic save, parsed data used if location not writable
+	if cache:
+		for stalePath in glob.glob(glob.escape(prefix) + "-*.npc.npy"):
+			try:
+				os.remove(stalePath)
+			except OSError:
+				pass
+		try:
+			os.makedirs(os.path.dirname(cachePath), exist_ok=True)
+			saveArrayAtomic(cachePath, data)
+		except OSError:
+			pass
+	return data
+
+def loadDataFile(file, delim, cols, colIndices, cache=None):
 	"""
 	loads delim separated file and extracts columns
 
@@ -470,12 +775,13 @@ def loadDataFile(file, delim, cols, colIndices):
 		delim : delemeter
 		cols : columns to use from file
 		colIndices ; columns to extract
+		cache : True if parsed data is cached, by default as per cache config
 	"""
-	data = np.loadtxt(file, delimiter=delim, usecols=cols)
+	data = loadCachedDataFile(file, delim, cols, cache)
 	extrData = data[:,colIndices]
 	return (data, extrData)
 
-def loadFeatDataFile(file, delim, cols):
+def loadFeatDataFile(file, delim, cols, cache=None):
 	"""
 	loads delim separated file and extracts columns
 	
@@ -483,9 +789,9 @@ def loadFeatDataFile(file, delim, cols):
 		file : file path
 		delim : delemeter
 		cols : columns to use from file
+		cache : True if parsed data is cached, by default as per cache config
 	"""
-	data = np.loadtxt(file, delimiter=delim, usecols=cols)
-	return data
+	return loadCachedDataFile(file, delim, cols, cache)
 
 def extrColumns(arr, columns):
 	"""
@@ -617,20 +923,301 @@ def jaccardSimilarity(x,y,wx=1.0,wy=1.0):
 	unionCardinality = len(sx.union(sy))
 	return intCardinality/float(intCardinality + wx * len(sxIntDiff) + wy * len(syIntDiff))
 
-def levenshteinSimilarity(s1, s2):
+def __asMatrix(x):
+	"""
+	2D float array or scipy sparse csr matrix
+	
+	Parameters
+		x : 2D array, list of lists or scipy sparse matrix
+	"""
+	if sparse.issparse(x):
+		return sparse.csr_matrix(x, dtype=np.float64)
+	x = np.asarray(x, dtype=np.float64)
+	if x.ndim == 1:
+		x = x.reshape(1, -1)
+	return x
+
+def __rowSqNorms(x):
+	"""
+	squared norm of each row
+	
+	Parameters
+		x : 2D array or sparse matrix
+	"""
+	if sparse.issparse(x):
+		return np.asarray(x.multiply(x).sum(axis=1)).ravel()
+	return np.einsum("ij,ij->i", x, x)
+
+def __dotBlock(x, y):
+	"""
+	x times y transpose as dense array
+	
+	Parameters
+		x : 2D array or sparse matrix
+		y : 2D array or sparse matrix
+	"""
+	d = x @ y.T
+	return d.toarray() if sparse.issparse(d) else np.asarray(d)
+
+def __pairwiseBlock(metric, x, y, yaux, params):
+	"""
+	distance or similarity block for rows of x against rows of y
+	
+	Parameters
+		metric : euclidean, cosine, manhattan, minkowski or jaccard
+		x : 2D array or sparse matrix
+		y : 2D array or sparse matrix
+		yaux : precomputed row statistics of y
+		params : metric parameters
+	"""
+	if metric == "euclidean":
+		sq = __rowSqNorms(x)[:,np.newaxis] + yaux[np.newaxis,:] - 2.0 * __dotBlock(x, y)
+		block = np.sqrt(np.maximum(sq, 0))
+	elif metric == "cosine":
+		den = np.sqrt(__rowSqNorms(x))[:,np.newaxis] * yaux[np.newaxis,:]
+		block = np.divide(__dotBlock(x, y), den, out=np.zeros((x.shape[0], y.shape[0])), where=den > 0)
+	elif metric == "manhattan" or metric == "minkowski":
+		xd = x.toarray() if sparse.issparse(x) else x
+		if metric == "manhattan":
+			block = cdist(xd, yaux, "cityblock")
+		else:
+			block = cdist(xd, yaux, "minkowski", p=params["pValue"])
+	elif metric == "jaccard":
+		xb = (x != 0).astype(np.float64)
+		inter = __dotBlock(xb, yaux[0])
+		xsize = np.asarray(xb.sum(axis=1)).ravel()[:,np.newaxis]
+		den = inter + params["wx"] * (xsize - inter) + params["wy"] * (yaux[1][np.newaxis,:] - inter)
+		block = np.divide(inter, den, out=np.zeros(inter.shape), where=den > 0)
+	else:
+		raise ValueError("invalid distance metric")
+	return block
+
+def __pairwiseAux(metric, y):
+	"""
+	row statistics of y used for all blocks
+	
+	Parameters
+		metric : distance metric
+		y : 2D array or sparse matrix
+	"""
+	if metric == "euclidean":
+		aux = __rowSqNorms(y)
+	elif metric == "cosine":
+		aux = np.sqrt(__rowSqNorms(y))
+	elif metric == "manhattan" or metric == "minkowski":
+		aux = y.toarray() if sparse.issparse(y) else y
+	elif metric == "jaccard":
+		yb = (y != 0).astype(np.float64)
+		aux = (yb, np.asarray(yb.sum(axis=1)).ravel())
+	else:
+		raise ValueError("invalid distance metric")
+	return aux
+
+def pairwiseBlockGen(metric, x, y=None, chunkSize=1000, pValue=2, wx=1.0, wy=1.0):
+	"""
+	generates distance or similarity blocks for chunks of rows of x against all rows of y, limiting
+	memory to chunk size times number of rows in y. Yields row offset and block
+	
+	Parameters
+		metric : euclidean, cosine, manhattan, minkowski or jaccard
+		x : 2D array or scipy sparse matrix
+		y : 2D array or scipy sparse matrix, x if None
+		chunkSize : number of rows of x in a block
+		pValue : power factor for minkowski
+		wx : weight for x for jaccard
+		wy : weight for y for jaccard
+	"""
+	selfPair = y is None
+	x = __asMatrix(x)
+	y = x if selfPair else __asMatrix(y)
+	assertEqual(x.shape[1], y.shape[1], "number of columns should be same")
+	params = {"pValue" : pValue, "wx" : wx, "wy" : wy}
+	yaux = __pairwiseAux(metric, y)
+	for beg in range(0, x.shape[0], chunkSize):
+		block = __pairwiseBlock(metric, x[beg:beg + chunkSize], y, yaux, params)
+		if selfPair and metric == "euclidean":
+			#exact zero self distance, dot product form leaves round off
+			rows = np.arange(block.shape[0])
+			block[rows, rows + beg] = 0
+		yield (beg, block)
+
+def pairwiseMatrix(metric, x, y=None, chunkSize=1000, pValue=2, wx=1.0, wy=1.0):
+	"""
+	full distance or similarity matrix between rows of x and rows of y, computed in row chunks
+	
+	Parameters
+		metric : euclidean, cosine, manhattan, minkowski or jaccard
+		x : 2D array or scipy sparse matrix
+		y : 2D array or scipy sparse matrix, x if None
+		chunkSize : number of rows of x in a block
+		pValue : power factor for minkowski
+		wx : weight for x for jaccard
+		wy : weight for y for jaccard
+	"""
+	blocks = list(map(lambda b : b[1], pairwiseBlockGen(metric, x, y, chunkSize, pValue, wx, wy)))
+	return np.vstack(blocks)
+
+def pairwiseTopK(metric, x, k, y=None, chunkSize=1000, pValue=2, wx=1.0, wy=1.0, excludeSelf=False):
+	"""
+	for each row of x, k nearest rows of y, smallest distance or largest similarity, sorted. Returns
+	index and value arrays of shape number of rows in x by k
+	
+	Parameters
+		metric : euclidean, cosine, manhattan, minkowski or jaccard
+		x : 2D array or scipy sparse matrix
+		k : number of nearest rows
+		y : 2D array or scipy sparse matrix, x if None
+		chunkSize : number of rows of x in a block
+		pValue : power factor for minkowski
+		wx : weight for x for jaccard
+		wy : weight for y for jaccard
+		excludeSelf : if True and y is None, a row is not its own neighbor
+	"""
+	largest = metric == "cosine" or metric == "jaccard"
+	excludeSelf = excludeSelf and y is None
+	indexes = list()
+	values = list()
+	for beg, block in pairwiseBlockGen(metric, x, y, chunkSize, pValue, wx, wy):
+		score = -block if largest else block
+		if excludeSelf:
+			rows = np.arange(block.shape[0])
+			score[rows, rows + beg] = np.inf
+		kk = min(k, block.shape[1])
+		part = np.argpartition(score, kk - 1, axis=1)[:,:kk]
+		order = np.argsort(np.take_along_axis(score, part, axis=1), axis=1, kind="stable")
+		ind = np.take_along_axis(part, order, axis=1)
+		indexes.append(ind)
+		values.append(np.take_along_axis(block, ind, axis=1))
+	return (np.vstack(indexes), np.vstack(values))
+
+def euclideanDistanceMatrix(x, y=None, chunkSize=1000):
+	"""
+	euclidean distance between all rows of x and y
+	
+	Parameters
+		x : 2D array or scipy sparse matrix
+		y : 2D array or scipy sparse matrix, x if None
+		chunkSize : number of rows of x in a block
+	"""
+	return pairwiseMatrix("euclidean", x, y, chunkSize)
+
+def cosineSimilarityMatrix(x, y=None, chunkSize=1000):
+	"""
+	cosine similarity between all rows of x and y, not rounded unlike cosineSimilarity
+	
+	Parameters
+		x : 2D array or scipy sparse matrix
+		y : 2D array or scipy sparse matrix, x if None
+		chunkSize : number of rows of x in a block
+	"""
+	return pairwiseMatrix("cosine", x, y, chunkSize)
+
+def manhattanDistanceMatrix(x, y=None, chunkSize=1000):
+	"""
+	manhattan distance between all rows of x and y
+	
+	Parameters
+		x : 2D array or scipy sparse matrix
+		y : 2D array or scipy sparse matrix, x if None
+		chunkSize : number of rows of x in a block
+	"""
+	return pairwiseMatrix("manhattan", x, y, chunkSize)
+
+def minkowskiDistanceMatrix(x, pValue, y=None, chunkSize=1000):
 	"""
-	Levenshtein similarity for strings
+	minkowski distance between all rows of x and y, not rounded unlike minkowskiDistance
 	
 	Parameters
-		sx : first string
-		sy : second string
+		x : 2D array or scipy sparse matrix
+		pValue : power factor
+		y : 2D array or scipy sparse matrix, x if None
+		chunkSize : number of rows of x in a block
+	"""
+	return pairwiseMatrix("minkowski", x, y, chunkSize, pValue=pValue)
+
+def jaccardSimilarityMatrix(x, y=None, wx=1.0, wy=1.0, chunkSize=1000):
+	"""
+	jaccard similarity between all rows of x and y, each row being indicator vector of a set with 
+	non zero for members
+	
+	Parameters
+		x : 2D array or scipy sparse matrix
+		y : 2D array or scipy sparse matrix, x if None
+		wx : weight for x
+		wy : weight for y
+		chunkSize : number of rows of x in a block
 	"""
-	assert type(s1) == str and type(s2) == str,  "Levenshtein similarity is for string only"
-	d = ld(s1,s2)
-	#print(d)
+	return pairwiseMatrix("jaccard", x, y, chunkSize, wx=wx, wy=wy)
+
+def setIndicatorMatrix(sets, vocab=None):
+	"""
+	sparse indicator matrix with one row for each set of items, for jaccard similarity
+	
+	Parameters
+		sets : list of item lists
+		vocab : dictionary of item to column index, built from items if None
+	"""
+	if vocab is None:
+		vocab = dict()
+		for items in sets:
+			for it in items:
+				if it not in vocab:
+					vocab[it] = len(vocab)
+	rows = list()
+	cols = list()
+	for i, items in enumerate(sets):
+		icols = set(map(lambda it : vocab[it], filter(lambda it : it in vocab, items)))
+		rows.extend([i] * len(icols))
+		cols.extend(icols)
+	data = np.ones(len(rows))
+	return sparse.csr_matrix((data, (rows, cols)), shape=(len(sets), max(len(vocab), 1)))
+
+def levenshteinSimilarity(s1, s2, threshold=None):
+	"""
+	Levenshtein similarity for strings. With threshold, similarity below it is returned as 0 and the
+	edit distance computation exits early once the threshold can no longer be reached
+	
+	Parameters
+		s1 : first string
+		s2 : second string
+		threshold : minimum similarity
+	"""
+	assert isinstance(s1, str) and isinstance(s2, str),  "Levenshtein similarity is for string only"
 	l = max(len(s1),len(s2))
-	d = 1.0 - min(d/l, 1.0)
-	return d	
+	if l == 0:
+		return 1.0
+	if threshold is None:
+		d = ld(s1,s2)
+	else:
+		#largest edit distance that still meets threshold, length difference is a lower bound
+		maxDist = int((1.0 - threshold) * l + 1e-9)
+		if abs(len(s1) - len(s2)) > maxDist:
+			return 0.0
+		d = ld(s1, s2, score_cutoff=maxDist)
+		if d > maxDist:
+			return 0.0
+	return 1.0 - d / l
+
+def levenshteinSimilarityBatch(s, candidates, threshold=None, njobs=1):
+	"""
+	Levenshtein similarity of a string with many candidate strings, as array. With threshold, 
+	similarity below it is 0
+	
+	Parameters
+		s : string
+		candidates : list of candidate strings
+		threshold : minimum similarity
+		njobs : number of threads, all cores if None
+	"""
+	assert isinstance(s, str),  "Levenshtein similarity is for string only"
+	njobs = -1 if njobs is None else njobs
+	#slightly loose cutoff for the kernel, exact threshold applied after as for single pair
+	cutoff = None if threshold is None else max(threshold - 1e-6, 0)
+	scores = rfprocess.cdist([s], candidates, scorer=rflevenshtein.normalized_similarity, score_cutoff=cutoff, \
+		dtype=np.float64, workers=njobs)[0]
+	if threshold is not None:
+		scores[scores < threshold - 1e-9] = 0
+	return scores
 
 def norm(values, po=2):
 	"""
@@ -933,16 +1520,15 @@ def scaleMinMaxTabData(tdata, minMax):
 
 	Parameters
 		tdata : 2D array
-		minMax : ni, max and range for each column
-	"""
-	stdata = list()
-	for r in tdata:
-		srdata = list()
-		for i, c in enumerate(r):
-			sd = (c - minMax[i][0]) / minMax[i][2]
-			srdata.append(sd)
-		stdata.append(srdata)
-	return stdata
+		minMax : ni, max and range for each column or column profiler
+	"""
+	if isinstance(minMax, ColumnProfiler):
+		minMax = minMax.getMinMax()
+	for i, mm in enumerate(minMax):
+		assert mm[0] is not None, "column {} has no non null value for scaling".format(i)
+	minMax = np.array(minMax, dtype=np.float64)
+	stdata = (np.asarray(tdata, dtype=np.float64) - minMax[:,0]) / minMax[:,2]
+	return stdata.tolist()
 	
 def scaleMinMax(rdata, minMax):
 	"""
@@ -1271,9 +1857,9 @@ class ShiftedDataGenerator:
 			ttdata.append(nrec)
 		return ttdata
 		
-class RollingStat(object):
+class RollingStat(WindowStat):
 	"""
-	stats for rolling windowt
+	stats for rolling window, ring buffer with O(1) update
 	"""
 	def __init__(self, wsize):
 		"""
@@ -1282,39 +1868,16 @@ class RollingStat(object):
 		Parameters
 			wsize : window size
 		"""
-		self.window = list()
-		self.wsize = wsize
-		self.mean = None
+		super(RollingStat, self).__init__(wsize)
 		self.sd = None
 
-	def add(self, value):
-		"""
-		add a value
-		
-		Parameters
-			value : value to add
-		"""
-		self.window.append(value)
-		if len(self.window) > self.wsize:
-			self.window = self.window[1:]
-		
 	def getStat(self):
 		"""
 		get rolling window mean and std deviation
 		"""
-		assertGreater(len(self.window), 0, "window is empty")
-		if len(self.window) == 1:
-			self.mean = self.window[0]
-			self.sd = 0
-		else:
-			self.mean = statistics.mean(self.window)
-			self.sd = statistics.stdev(self.window, xbar=self.mean)
-		re = (self.mean, self.sd)
+		re = super(RollingStat, self).getStat()
+		self.sd = re[1]
 		return re
 		
-	def getSize(self):
-		"""
-		return window size
-		"""
-		return len(self.window)
-		
\ No newline at end of file
+
+__all__ = moduleExports(globals())
@@ -21,11 +21,12 @@ import time
 import math
 import random
 import numpy as np
-from scipy import stats
 from random import randint
 from util import *
 from stats import Histogram
 
+stats = LazyImport("scipy.stats")
+
 def randomFloat(low, high):
 	"""
 	sample float within range
@@ -1377,3 +1378,5 @@ def createSampler(data):
 			
 				
 				
+
+__all__ = moduleExports(globals())
@@ -354,94 +354,60 @@ class RunningStat:
 		s = (self.count, self.sum, self.sumSq)
 		return s
 		
-class SlidingWindowStat:
+class SlidingWindowStat(WindowStat):
 	"""
-	sliding window stats
+	sliding window stats, ring buffer with O(1) update
 	"""
-	def __init__(self):
+	def __init__(self, count):
 		"""
 		initializer
+		
+		Parameters
+			count : window size
 		"""
-		self.sum = 0.0
-		self.sumSq = 0.0
-		self.count = 0
-		self.values = None
+		super(SlidingWindowStat, self).__init__(count)
+		self.count = count
 	
 	@staticmethod
-	def create(values, sum, sumSq):
+	def create(values, sum=None, sumSq=None):
 		"""
-    	creates iinstance	
-     	
+		creates instance, sums are recomputed from values	
+		
 		Parameters
+			values : list of values
 			sum : sum of values
-			sumSq : sum of valure squared
+			sumSq : sum of values squared
 		"""
-		sws = SlidingWindowStat()
-		sws.sum = sum
-		sws.sumSq = sumSq
-		self.values = values.copy()
-		sws.count = len(self.values)
-		return sws
+		return SlidingWindowStat.initialize(values)
 		
 	@staticmethod
 	def initialize(values):
 		"""
-    	creates iinstance	
-     	
+		creates instance with window size same as number of values
+		
 		Parameters
 			values : list of values
 		"""
-		sws = SlidingWindowStat()
-		sws.values = values.copy()
-		for v in sws.values:
-			sws.sum += v
-			sws.sumSq += v * v		
-		sws.count = len(sws.values)
+		sws = SlidingWindowStat(len(values))
+		sws.addMany(values)
 		return sws
 
 	@staticmethod
 	def createEmpty(count):
 		"""
-    	creates iinstance	
-     	
-		Parameters
-			count : count of values
-		"""
-		sws = SlidingWindowStat()
-		sws.count = count
-		sws.values = list()
-		return sws
-
-	def add(self, value):
-		"""
-		adds new value
+		creates empty instance
 		
 		Parameters
-			value : value to add
-		"""
-		self.values.append(value)		
-		if len(self.values) > self.count:
-			self.sum += value - self.values[0]
-			self.sumSq += (value * value) - (self.values[0] * self.values[0])
-			self.values.pop(0)
-		else:
-			self.sum += value
-			self.sumSq += (value * value)
-		
-
-	def getStat(self):
-		"""
-		calculate mean and std deviation 
+			count : window size
 		"""
-		mean = self.sum /self. count
-		t = self.sumSq / (self.count - 1) - mean * mean * self.count / (self.count - 1)
-		sd = math.sqrt(t)
-		re = (mean, sd)
-		return re
+		return SlidingWindowStat(count)
 
 	def addGetStat(self,value):
 		"""
 		calculate mean and std deviation with new value added
+		
+		Parameters
+			value : value to add
 		"""
 		self.add(value)
 		re = self.getStat()
@@ -449,24 +415,213 @@ class SlidingWindowStat:
 	
 	def getCount(self):
 		"""
-		return count
+		return window size
 		"""
 		return self.count
 	
 	def getCurSize(self):
 		"""
-		return count
+		return number of values in window
 		"""
-		return len(self.values)
+		return self.size
 		
 	def getState(self):
 		"""
-		return state
+		return state as window size, sum and sum of squares
 		"""
-		s = (self.count, self.sum, self.sumSq)
+		s = (self.count, self.mean * self.size, self.m2 + self.mean * self.mean * self.size)
 		return s
 		
 
+class ColumnSummary:
+	"""
+	mergeable summary of a numeric column built chunk by chunk, with count, moments, min, max, 
+	null count, extreme values and a compacting quantile sketch for approximate quantiles and histogram
+	"""
+	def __init__(self, sketchSize=2048, nextreme=5):
+		"""
+		initializer
+		
+		Parameters
+			sketchSize : max num of values retained in each sketch level
+			nextreme : num of extreme values retained
+		"""
+		self.sketchSize = sketchSize
+		self.nextreme = nextreme
+		self.count = 0
+		self.nullCount = 0
+		self.mean = 0.0
+		self.m2 = 0.0
+		self.m3 = 0.0
+		self.m4 = 0.0
+		self.vmin = None
+		self.vmax = None
+		self.smallest = np.empty(0)
+		self.largest = np.empty(0)
+		self.levels = list()
+
+	def add(self, values):
+		"""
+		adds a chunk of values, nan values being counted as null
+		
+		Parameters
+			values : list or numpy array of values
+		"""
+		values = np.asarray(values, dtype=np.float64).ravel()
+		nulls = np.isnan(values)
+		cs = ColumnSummary(self.sketchSize, self.nextreme)
+		cs.nullCount = int(nulls.sum())
+		values = values[~nulls]
+		if len(values) > 0:
+			cs.count = len(values)
+			cs.mean = values.mean()
+			dev = values - cs.mean
+			dsq = dev * dev
+			cs.m2 = dsq.sum()
+			cs.m3 = (dsq * dev).sum()
+			cs.m4 = (dsq * dsq).sum()
+			cs.vmin = values.min()
+			cs.vmax = values.max()
+			cs.smallest = np.sort(values)[:self.nextreme] if len(values) <= self.nextreme else \
+			np.sort(np.partition(values, self.nextreme - 1)[:self.nextreme])
+			cs.largest = np.sort(values)[-self.nextreme:] if len(values) <= self.nextreme else \
+			np.sort(np.partition(values, -self.nextreme)[-self.nextreme:])
+			cs.levels = [values.copy()]
+			cs.__compact()
+		self.merge(cs)
+
+	def merge(self, other):
+		"""
+		merges another summary into this one
+		
+		Parameters
+			other : other column summary
+		"""
+		self.nullCount += other.nullCount
+		if other.count == 0:
+			return
+		if self.count == 0:
+			self.count, self.mean, self.m2, self.m3, self.m4 = other.count, other.mean, other.m2, other.m3, other.m4
+			self.vmin, self.vmax = other.vmin, other.vmax
+			self.smallest, self.largest = other.smallest.copy(), other.largest.copy()
+			self.levels = list(map(lambda l : l.copy(), other.levels))
+			return
+		
+		#pairwise combination of central moments
+		na = self.count
+		nb = other.count
+		n = na + nb
+		delta = other.mean - self.mean
+		d2 = delta * delta
+		m4 = self.m4 + other.m4 + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / (n * n * n) + \
+		6 * d2 * (na * na * other.m2 + nb * nb * self.m2) / (n * n) + 4 * delta * (na * other.m3 - nb * self.m3) / n
+		m3 = self.m3 + other.m3 + delta * d2 * na * nb * (na - nb) / (n * n) + 3 * delta * (na * other.m2 - nb * self.m2) / n
+		m2 = self.m2 + other.m2 + d2 * na * nb / n
+		self.mean += delta * nb / n
+		self.m2, self.m3, self.m4 = m2, m3, m4
+		self.count = n
+		self.vmin = min(self.vmin, other.vmin)
+		self.vmax = max(self.vmax, other.vmax)
+		self.smallest = np.sort(np.concatenate((self.smallest, other.smallest)))[:self.nextreme]
+		self.largest = np.sort(np.concatenate((self.largest, other.largest)))[-self.nextreme:]
+		for i, l in enumerate(other.levels):
+			if i < len(self.levels):
+				self.levels[i] = np.concatenate((self.levels[i], l))
+			else:
+				self.levels.append(l.copy())
+		self.__compact()
+
+	def __compact(self):
+		"""
+		compacts sketch levels exceeding size by promoting every other sorted value to next level
+		with double weight
+		"""
+		i = 0
+		while i < len(self.levels):
+			if len(self.levels[i]) > self.sketchSize:
+				l = np.sort(self.levels[i])
+				if len(l) % 2 == 1:
+					self.levels[i] = l[-1:]
+					l = l[:-1]
+				else:
+					self.levels[i] = np.empty(0)
+				promoted = l[random.randint(0, 1)::2]
+				if i + 1 < len(self.levels):
+					self.levels[i + 1] = np.concatenate((self.levels[i + 1], promoted))
+				else:
+					self.levels.append(promoted)
+			i += 1
+
+	def getWeightedValues(self):
+		"""
+		returns sorted sketch values and their weights
+		"""
+		values = np.concatenate(self.levels) if self.levels else np.empty(0)
+		weights = np.concatenate(list(map(lambda r : np.full(len(r[1]), 2.0 ** r[0]), enumerate(self.levels)))) \
+		if self.levels else np.empty(0)
+		order = np.argsort(values, kind="stable")
+		return (values[order], weights[order])
+
+	def getStat(self):
+		"""
+		returns dictionary of summary statistics
+		"""
+		stat = dict()
+		stat["length"] = self.count
+		stat["nullCount"] = self.nullCount
+		stat["min"] = self.vmin
+		stat["max"] = self.vmax
+		stat["n smallest"] = self.smallest.tolist()
+		stat["n largest"] = self.largest.tolist()
+		stat["mean"] = self.mean
+		stat["median"] = self.quantile(0.5)
+		stat["std"] = math.sqrt(self.m2 / self.count) if self.count > 0 else None
+		stat["skew"] = math.sqrt(self.count) * self.m3 / self.m2 ** 1.5 if self.m2 > 0 else None
+		stat["kurtosis"] = self.count * self.m4 / (self.m2 * self.m2) - 3.0 if self.m2 > 0 else None
+		return stat
+
+	def quantile(self, q):
+		"""
+		returns approximate value at quantile
+		
+		Parameters
+			q : quantile between 0 and 1
+		"""
+		assertWithinRange(q, 0, 1.0, "quantile should be between 0 and 1")
+		values, weights = self.getWeightedValues()
+		if len(values) == 0:
+			return None
+		cweights = np.cumsum(weights)
+		i = np.searchsorted(cweights, q * cweights[-1], side="left")
+		return values[min(i, len(values) - 1)]
+
+	def percentileOfScore(self, value):
+		"""
+		returns approximate percentile of a value
+		
+		Parameters
+			value : value
+		"""
+		values, weights = self.getWeightedValues()
+		total = weights.sum()
+		below = weights[values < value].sum()
+		equal = weights[values == value].sum()
+		return 100.0 * (below + 0.5 * equal) / total
+
+	def histogram(self, nbins, limits=None):
+		"""
+		returns approximate bin counts
+		
+		Parameters
+			nbins : num of bins
+			limits : lower and upper limit, min and max by default
+		"""
+		values, weights = self.getWeightedValues()
+		if limits is None:
+			limits = (self.vmin, self.vmax)
+		counts, _ = np.histogram(values, bins=nbins, range=limits, weights=weights)
+		return counts * self.count / max(weights.sum(), 1)
+
 def basicStat(ldata):
 	"""
 	mean and std dev
@@ -488,9 +643,5 @@ def getFileColumnStat(filePath, col, delem=","):
 		col : col index
 		delem : field delemter
 	"""
-	rs = RunningStat()
-	for rec in fileRecGen(filePath, delem):
-		va = float(rec[col])
-		rs.add(va)
-		
-	return rs.getStat()
+	st = ColumnProfiler([col]).addFile(filePath, delem).getStat()[0]
+	return (st["mean"], st["sd"])
@@ -22,13 +22,26 @@ import time
 import uuid
 from datetime import datetime
 import math
+import bisect
+import itertools
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
+import importlib
+import io
+import gzip
+import bz2
+import lzma
+import threading
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import logging
 import logging.handlers
 import pickle
+import json
+import struct
+import mmap
+import hashlib
 from contextlib import contextmanager
 
 tokens = ["0","1","2","3","4","5","6","7","8","9","A","B","C","D","E","F","G","H","I","J","K","L","M",
@@ -56,6 +69,89 @@ ftPerYard = 3
 ftPerMile = ftPerYard * 1760
 
 
+class LazyImport:
+	"""
+	module or module attribute imported on first use, to keep heavy imports out of start up. Own 
+	members are private so that every public attribute is forwarded to the imported module
+	"""
+	def __init__(self, modName, attrName=None):
+		"""
+		initializer
+		
+		Parameters
+			modName : module name
+			attrName : attribute name within module, None for module itself
+		"""
+		self._modName = modName
+		self._attrName = attrName
+		self._obj = None
+
+	def _load(self):
+		"""
+		imports module and returns module or attribute
+		"""
+		if self._obj is None:
+			obj = importlib.import_module(self._modName)
+			if self._attrName is not None:
+				obj = getattr(obj, self._attrName)
+			self._obj = obj
+		return self._obj
+
+	def __getattr__(self, name):
+		"""
+		gets attribute of imported module or attribute
+		
+		Parameters
+			name : attribute name
+		"""
+		if name in ("_modName", "_attrName", "_obj"):
+			raise AttributeError(name)
+		return getattr(self._load(), name)
+
+	def __call__(self, *args, **kwargs):
+		"""
+		calls imported attribute
+		
+		Parameters
+			args : positional arguments
+			kwargs : keyword arguments
+		"""
+		return self._load()(*args, **kwargs)
+
+def moduleExports(namespace):
+	"""
+	public names of a module for star import, lazy import proxies left out so that they do not shadow
+	modules imported by the importing module
+	
+	Parameters
+		namespace : module name space as returned by globals()
+	"""
+	return list(filter(lambda n : not n.startswith("_") and not isinstance(namespace[n], LazyImport), namespace.keys()))
+
+plt = LazyImport("matplotlib.pyplot")
+zstandard = LazyImport("zstandard")
+lz4frame = LazyImport("lz4.frame")
+sparse = LazyImport("scipy.sparse")
+
+#saved object file format
+objMagic = b"AVOBJ\x00"
+objVersion = 1
+objAlign = 64
+
+#compression format magic numbers, bz2 magic followed by block size digit
+compMagic = [(b"\x1f\x8b", "gzip")] + list(map(lambda d : (b"BZh" + str(d).encode(), "bz2"), range(1, 10))) + \
+[(b"\xfd7zXZ\x00", "xz"), (b"\x28\xb5\x2f\xfd", "zstd")]
+
+#file read buffer size and background decompression flag
+fileReadConfig = {"bufSize" : 1048576, "background" : False}
+
+#line index persistence flag and location, user cache directory if location is None
+lineIndexConfig = {"enabled" : True, "cacheDir" : None}
+
+#suffixes of cache files, skipped when listing files
+cacheFileSuffixes = (".lidx.npy", ".npc.npy")
+
+
 def genID(size):
 	"""
 	generates ID
@@ -70,16 +166,14 @@ def genID(size):
 
 def genIdList(numId, idSize):
 	"""
-	generate list of IDs
+	generate list of IDs, in bulk with random generator seeded from the random module, so that random.seed
+	makes the list reproducible, though not the same list as generated with genID for the same seed
 	
 	Parameters:
 		numId: number of Ids
 		idSize: ID size
 	"""
-	iDs = []
-	for i in range(numId):
-		iDs.append(genID(idSize))
-	return iDs
+	return genIDArr(numId, idSize)
 	
 def genNumID(size):
 	"""
@@ -217,6 +311,114 @@ def setListRandomFromList(ldata, ldataRepl):
 		ldata[i] = d
 		selSet.add(i)
 		
+def __bulkRandGen():
+	"""
+	numpy random generator for bulk generation, seeded from the random module so that random.seed makes
+	bulk output reproducible as with the scalar generators
+	"""
+	return np.random.default_rng(random.getrandbits(64))
+
+def __resampleDuplicates(arr, sampler):
+	"""
+	replaces repeated elements or rows with new samples until all are distinct, order kept
+
+	Parameters
+		arr : 1D or 2D array of samples
+		sampler : function returning given number of new samples
+	"""
+	num = len(arr)
+	while True:
+		uniq, first = np.unique(arr, axis=0, return_index=True)
+		ndup = num - len(uniq)
+		if ndup == 0:
+			break
+		dup = np.ones(num, dtype=bool)
+		dup[first] = False
+		arr[dup] = sampler(ndup)
+	return arr
+
+def __genStrArr(num, size, chars, unique):
+	"""
+	generates array of random strings from given chars, vectorized
+
+	Parameters
+		num : number of strings
+		size : size of each string
+		chars : list of chars
+		unique : if True all strings are distinct
+	"""
+	if size == 0:
+		if unique:
+			assertLesserEqual(num, 1, "not enough distinct strings for the size")
+		return np.full(num, "", dtype="U1")
+	if unique:
+		chars = list(dict.fromkeys(chars))
+	codes = np.frombuffer("".join(chars).encode("ascii"), dtype=np.uint8)
+	nchars = len(codes)
+	space = nchars ** size
+	rgen = __bulkRandGen()
+	if unique and space < 2 ** 63:
+		#distinct integers in the string space as base nchars digits
+		assertLesserEqual(num, space, "not enough distinct strings for the size")
+		if 2 * num >= space:
+			#dense, permutation of the whole space is not much larger than the output
+			vals = rgen.choice(space, num, replace=False)
+		else:
+			vals = __resampleDuplicates(rgen.integers(0, space, num), lambda n : rgen.integers(0, space, n))
+		digits = (vals[:,np.newaxis] // (nchars ** np.arange(size - 1, -1, -1, dtype=np.int64))) % nchars
+	else:
+		digits = rgen.integers(0, nchars, (num, size))
+		if unique:
+			#space too large for integer mapping, collisions are rare and regenerated
+			digits = __resampleDuplicates(digits, lambda n : rgen.integers(0, nchars, (n, size)))
+	sarr = codes[digits].view("S" + str(size)).ravel()
+	return sarr.astype("U" + str(size))
+
+def genIDArr(num, size, unique=False):
+	"""
+	generates list of IDs in bulk
+	
+	Parameters
+		num : number of IDs
+		size : size of ID
+		unique : if True IDs are distinct
+	"""
+	return __genStrArr(num, size, tokens, unique).tolist()
+
+def genNumIDArr(num, size, unique=False):
+	"""
+	generates list of IDs consisting of digits only in bulk
+	
+	Parameters
+		num : number of IDs
+		size : size of ID
+		unique : if True IDs are distinct
+	"""
+	return __genStrArr(num, size, numTokens, unique).tolist()
+
+def genLowCaseIDArr(num, size, unique=False):
+	"""
+	generates list of IDs consisting of lower case chars in bulk
+	
+	Parameters
+		num : number of IDs
+		size : size of ID
+		unique : if True IDs are distinct
+	"""
+	return __genStrArr(num, size, loCaseChars, unique).tolist()
+
+def genPhoneNumArr(num, arCode, unique=False):
+	"""
+	generates list of phone numbers in bulk
+	
+	Parameters
+		num : number of phone numbers
+		arCode: area code
+		unique : if True phone numbers are distinct
+	"""
+	phNums = __genStrArr(num, 7, numTokens, unique)
+	return np.char.add(arCode, phNums).tolist()
+
 def genIpAddress():
 	"""
 	generates IP address
@@ -279,19 +481,25 @@ def isInRange(val, minv, maxv):
 	"""
 	return val >= minv and val <= maxv
 	
-def stripFileLines(filePath, offset):
+def stripFileLines(filePath, offset, indexes=None):
 	"""
 	strips number of chars from both ends
 	
 	Parameters
 		filePath : file path
 		offset : offset from both ends of  line 
-	"""
-	fp = open(filePath, "r")
-	for line in fp:
-		stripped = line[offset:len(line) - 1 - offset]
-		print (stripped)
-	fp.close()
+		indexes : line indexes to strip, all lines if None 
+	"""
+	if indexes is None:
+		fp = openTextFile(filePath)
+		for line in fp:
+			stripped = line[offset:len(line) - 1 - offset]
+			print (stripped)
+		fp.close()
+	else:
+		for line in LineIndex(filePath).lineGen(indexes):
+			stripped = line[offset:len(line) - offset]
+			print (stripped)
 
 def genLatLong(lat1, long1, lat2, long2):
 	"""
@@ -307,6 +515,42 @@ def genLatLong(lat1, long1, lat2, long2):
 	longg = long1 + (long2 - long1) * random.random()
 	return (lat, longg)
 
+def genIpAddressArr(num, unique=False):
+	"""
+	generates list of IP addresses in bulk, each part between 0 and 255
+	
+	Parameters
+		num : number of IP addresses
+		unique : if True IP addresses are distinct
+	"""
+	rgen = __bulkRandGen()
+	if unique:
+		assertLesserEqual(num, 2 ** 32, "not enough distinct IP addresses")
+		ips = rgen.choice(2 ** 32, num, replace=False)
+	else:
+		ips = rgen.integers(0, 2 ** 32, num, dtype=np.int64)
+	parts = list(map(lambda sh : ((ips >> sh) & 255).astype(str), [24, 16, 8, 0]))
+	ipa = parts[0]
+	for pa in parts[1:]:
+		ipa = np.char.add(np.char.add(ipa, "."), pa)
+	return ipa.tolist()
+
+def genLatLongArr(num, lat1, long1, lat2, long2):
+	"""
+	generate lat and long arrays within limits in bulk
+	
+	Parameters
+		num : number of locations
+		lat1 : lat of 1st point
+		long1 : long of 1st point
+		lat2 : lat of 2nd point
+		long2 : long of 2nd point
+	"""
+	rgen = __bulkRandGen()
+	lat = lat1 + (lat2 - lat1) * rgen.random(num)
+	longg = long1 + (long2 - long1) * rgen.random(num)
+	return (lat, longg)
+
 def geoDistance(lat1, long1, lat2, long2):
 	"""
 	find geo distance in ft
@@ -749,41 +993,281 @@ def typedValue(val, dtype=None):
 	
 	return tVal
 	
-def getAllFiles(dirPath):
+def parallelMapGen(func, argsList, njobs=None, useProcess=False, maxInFlight=None):
+	"""
+	generates results of function applied to each argument tuple in parallel, in input order. Number
+	of submitted but not yet consumed tasks is bounded, limiting memory in flight
+
+	Parameters
+		func : function, module level if process pool is used
+		argsList : iterable of argument tuples
+		njobs : number of workers, number of cpus for process pool and a few more for thread pool if None
+		useProcess : if True process pool for CPU bound work otherwise thread pool for I/O bound work
+		maxInFlight : max number of pending tasks, twice the number of workers if None
+	"""
+	ncpu = os.cpu_count() or 1
+	if njobs is None:
+		njobs = ncpu if useProcess else min(32, ncpu + 4)
+	maxInFlight = 2 * njobs if maxInFlight is None else maxInFlight
+	executor = ProcessPoolExecutor(njobs) if useProcess else ThreadPoolExecutor(njobs)
+	with executor:
+		pending = deque()
+		for args in argsList:
+			if len(pending) == maxInFlight:
+				yield pending.popleft().result()
+			pending.append(executor.submit(func, *args))
+		while len(pending) > 0:
+			yield pending.popleft().result()
+
+def scanDir(dirPath):
+	"""
+	files and sub directories in a directory, same as one level of os.walk. Symbolic links to directories
+	are not followed and unreadable directories are skipped
+
+	Parameters
+		dirPath : directory path
+	"""
+	files = list()
+	subDirs = list()
+	try:
+		it = os.scandir(dirPath)
+	except OSError:
+		return (files, subDirs)
+	with it:
+		for entry in it:
+			try:
+				isDir = entry.is_dir()
+			except OSError:
+				isDir = False
+			if isDir:
+				if not entry.is_symlink():
+					subDirs.append(entry.path)
+			else:
+				files.append(entry.path)
+	return (files, subDirs)
+
+def getAllFiles(dirPath, njobs=None):
 	"""
-	get all files recursively
+	get all files recursively, optionally with directories in each level of the tree scanned in parallel
 	
 	Parameters
 		dirPath : directory path
+		njobs : number of threads for parallel scan, serial scan with os.walk if None or 1
 	"""
 	filePaths = []
-	for (thisDir, subDirs, fileNames) in os.walk(dirPath):
-		for fileName in fileNames:
-			filePaths.append(os.path.join(thisDir, fileName))
+	if njobs is None or njobs == 1:
+		for (thisDir, subDirs, fileNames) in os.walk(dirPath):
+			for fileName in fileNames:
+				filePaths.append(os.path.join(thisDir, fileName))
+	else:
+		dirs = [dirPath]
+		while len(dirs) > 0:
+			subDirs = list()
+			for files, sdirs in parallelMapGen(scanDir, map(lambda d : (d,), dirs), njobs):
+				filePaths.extend(files)
+				subDirs.extend(sdirs)
+			dirs = subDirs
+	filePaths = list(filter(lambda f : not f.endswith(cacheFileSuffixes), filePaths))
 	filePaths.sort()
 	return filePaths
 
-def getFileContent(fpath, verbose=False):
+def userCacheDir(name):
+	"""
+	cache directory for a kind of cache files under the user cache directory, outside any data directory
+	
+	Parameters
+		name : cache name
+	"""
+	cacheHome = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+	return os.path.join(cacheHome, "avenir", name)
+
+def setLineIndexConfig(enabled=None, cacheDir=None):
+	"""
+	sets line index persistence flag and location used by line index
+	
+	Parameters
+		enabled : True if line index is persisted
+		cacheDir : index directory, by default lidx under user cache directory
+	"""
+	if enabled is not None:
+		lineIndexConfig["enabled"] = enabled
+	if cacheDir is not None:
+		lineIndexConfig["cacheDir"] = cacheDir
+
+def setFileReadConfig(bufSize=None, background=None):
+	"""
+	sets read buffer size and background decompression flag used by all file readers
+	
+	Parameters
+		bufSize : read buffer size
+		background : if True decompression runs in a background thread
+	"""
+	if bufSize is not None:
+		assertGreater(bufSize, 0, "buffer size should be positive")
+		fileReadConfig["bufSize"] = bufSize
+	if background is not None:
+		fileReadConfig["background"] = background
+
+def getFileCompression(filePath):
+	"""
+	detects compression format from magic number, returns gzip, bz2, xz, zstd or None
+	
+	Parameters
+		filePath : file path
+	"""
+	with open(filePath, "rb") as fp:
+		head = fp.read(6)
+	comp = None
+	for magic, name in compMagic:
+		if head.startswith(magic):
+			comp = name
+			break
+	return comp
+
+def openTextFile(filePath, bufSize=None, background=None):
+	"""
+	opens plain or gzip, bz2, xz, zstd compressed file for reading text, decompressing as a stream
+	
+	Parameters
+		filePath : file path
+		bufSize : read buffer size, configured size if None
+		background : if True decompression runs in a background thread, configured flag if None
+	"""
+	bufSize = fileReadConfig["bufSize"] if bufSize is None else bufSize
+	background = fileReadConfig["background"] if background is None else background
+	comp = getFileCompression(filePath)
+	if comp is None:
+		return open(filePath, "r", buffering=bufSize)
+	
+	if comp == "gzip":
+		src = gzip.open(filePath, "rb")
+	elif comp == "bz2":
+		src = bz2.open(filePath, "rb")
+	elif comp == "xz":
+		src = lzma.open(filePath, "rb")
+	else:
+		fp = open(filePath, "rb")
+		src = zstandard.ZstdDecompressor().stream_reader(fp, read_size=bufSize, closefd=True)
+	if background:
+		src = BackgroundReader(src, bufSize)
+	return io.TextIOWrapper(io.BufferedReader(src, bufSize))
+
+class BackgroundReader(io.RawIOBase):
+	"""
+	binary stream read ahead in a background thread, so that decompression overlaps with parsing
+	"""
+	def __init__(self, src, blockSize, nblocks=4):
+		"""
+		initilizer
+		
+		Parameters
+			src : source binary stream
+			blockSize : read block size
+			nblocks : max number of blocks read ahead
+		"""
+		self.src = src
+		self.blockSize = blockSize
+		self.blocks = queue.Queue(nblocks)
+		self.pending = memoryview(b"")
+		self.done = False
+		self.stopped = threading.Event()
+		self.thread = threading.Thread(target=self.__readAhead, daemon=True)
+		self.thread.start()
+
+	def __readAhead(self):
+		"""
+		reads blocks from source until end or close
+		"""
+		try:
+			while not self.stopped.is_set():
+				block = self.src.read(self.blockSize)
+				self.__put(block)
+				if len(block) == 0:
+					break
+		except Exception as ex:
+			self.__put(ex)
+
+	def __put(self, item):
+		"""
+		queues block unless reader is closed
+		
+		Parameters
+			item : block or exception
+		"""
+		while not self.stopped.is_set():
+			try:
+				self.blocks.put(item, timeout=0.1)
+				break
+			except queue.Full:
+				pass
+
+	def readable(self):
+		return True
+
+	def readinto(self, buf):
+		"""
+		reads into buffer
+		
+		Parameters
+			buf : buffer
+		"""
+		if len(self.pending) == 0 and not self.done:
+			item = self.blocks.get()
+			if isinstance(item, Exception):
+				raise item
+			if len(item) == 0:
+				self.done = True
+			self.pending = memoryview(item)
+		n = min(len(buf), len(self.pending))
+		buf[:n] = self.pending[:n]
+		self.pending = self.pending[n:]
+		return n
+
+	def close(self):
+		"""
+		stops read ahead and closes source
+		"""
+		if not self.closed:
+			self.stopped.set()
+			self.thread.join()
+			self.src.close()
+		super().close()
+
+def getFileContent(fpath, verbose=False, njobs=None):
 	"""
 	get file contents in directory
 	
 	Parameters
 		fpath ; directory path
 		verbose : verbosity flag
+		njobs : number of threads, default if None
 	"""
 	# dcument list
 	docComplete  = []
-	filePaths = getAllFiles(fpath)
+	filePaths = []
 
 	# read files
-	for filePath in filePaths:
+	for filePath, content in fileContentGen(fpath, njobs):
 		if verbose:
 			print("next file " + filePath)
-		with open(filePath, 'r') as contentFile:
-			content = contentFile.read()
-			docComplete.append(content)
+		docComplete.append(content)
+		filePaths.append(filePath)
 	return (docComplete, filePaths)
 
+def fileContentGen(fpath, njobs=None, maxInFlight=None):
+	"""
+	generates file path and content for all files in directory, files read in parallel with threads,
+	in sorted path order
+	
+	Parameters
+		fpath ; directory path
+		njobs : number of threads, default if None
+		maxInFlight : max number of files read ahead
+	"""
+	filePaths = getAllFiles(fpath, njobs)
+	contents = parallelMapGen(getOneFileContent, map(lambda f : (f,), filePaths), njobs, False, maxInFlight)
+	yield from zip(filePaths, contents)
+
 def getOneFileContent(fpath):
 	"""
 	get one file contents
@@ -791,7 +1275,7 @@ def getOneFileContent(fpath):
 	Parameters
 		fpath : file path
 	"""
-	with open(fpath, 'r') as contentFile:
+	with openTextFile(fpath) as contentFile:
 		docStr = contentFile.read()
 	return docStr
 	
@@ -810,18 +1294,25 @@ def getFileLines(dirPath, delim=","):
 
 def getFileSampleLines(dirPath, percen, delim=","):
 	"""
-	get sampled lines from a file
+	get uniformly sampled lines from a file, reading only the sampled lines through line index for
+	uncompressed file
 	
 	Parameters
 		dirPath : file path
 		percen : sampling percentage
 		delim : delemeter
 	"""
-	lines = list()
-	for li in fileRecGen(dirPath, delim):
-		if randint(0, 100) < percen:
-			lines.append(li)		
-	return lines
+	if getFileCompression(dirPath) is not None:
+		#no random access into compressed stream
+		lines = list()
+		for li in fileRecGen(dirPath, delim):
+			if randint(0, 100) < percen:
+				lines.append(li)		
+		return lines
+	
+	lindex = LineIndex(dirPath)
+	size = int(round(lindex.lineCount() * percen / 100))
+	return lindex.sample(size, delim)
 
 def getFileColumnAsString(dirPath, index, delim=","):
 	"""
@@ -881,6 +1372,20 @@ def getFileColumnAsInt(dirPath, index, delim=","):
 	fields = getFileColumnAsString(dirPath, index, delim)
 	return list(map(lambda v:int(v), fields))
 
+def getFileColumnAsArray(dirPath, index, dtype, delim=","):
+	"""
+	get typed column from a file as numpy array
+	
+	Parameters
+		dirPath : file path
+		index : index
+		dtype : data type int or float
+		delim : delemeter
+	"""
+	reader = TypedFileReader(str(index) + ":" + dtype, [index])
+	cols = reader.read(dirPath, delim)
+	return cols[0] if len(cols) > 0 else np.array([])
+
 def getFileAsIntMatrix(dirPath, columns, delim=","):
 	"""
 	extracts int matrix from csv file given column indices with each row being  concatenation of 
@@ -950,15 +1455,8 @@ def getFileAsTypedRecords(dirPath, types, delim=","):
 		types : data types
 		delim : delemeter
 	"""
-	(dtypes, cvalues) = extractTypesFromString(types)	
-	tdata = list()
-	for rec in  fileRecGen(dirPath, delim):
-		trec = list()
-		for index, value in enumerate(rec):
-			value = __convToTyped(index, value, dtypes)
-			trec.append(value)
-		tdata.append(trec)
-	return tdata
+	reader = TypedFileReader(types)
+	return list(reader.recGen(dirPath, delim))
 
 	
 def getFileColsAsTypedRecords(dirPath, columns, types, delim=","):
@@ -966,27 +1464,19 @@ def getFileColsAsTypedRecords(dirPath, columns, types, delim=","):
 	extracts typed records from csv file given column indices with each row being concatenation of  
 	extracted column values 
 
-	Parameters
 	Parameters
 		dirPath : file path
 		columns : column indexes
 		types : data types
 		delim : delemeter
 	"""
-	(dtypes, cvalues) = extractTypesFromString(types)	
-	tdata = list()
-	for rec in  fileSelFieldsRecGen(dirPath, columns, delim):
-		trec = list()
-		for indx, value in enumerate(rec):
-			tindx = columns[indx]
-			value = __convToTyped(tindx, value, dtypes)
-			trec.append(value)
-		tdata.append(trec)
-	return tdata
+	reader = TypedFileReader(types, columns)
+	return list(reader.recGen(dirPath, delim))
 
 def getFileColumnsMinMax(dirPath, columns, dtype, delim=","):
 	"""
-	extracts numeric matrix from csv file given column indices. For each column return min and max
+	extracts numeric matrix from csv file given column indices. For each column return min and max,
+	computed in one streaming pass
 
 	Parameters
 		dirPath : file path
@@ -994,27 +1484,8 @@ def getFileColumnsMinMax(dirPath, columns, dtype, delim=","):
 		dtype : data type
 		delim : delemeter
 	"""
-	dtypes = list(map(lambda c : str(c) + ":" + dtype, columns))
-	dtypes = ",".join(dtypes)
-	#print(dtypes)
-	
-	tdata = getFileColsAsTypedRecords(dirPath, columns, dtypes, delim)
-	minMax = list()
-	ncola = len(tdata[0])
-	ncole = len(columns)
-	assertEqual(ncola, ncole, "actual no of columns different from expected")
-	
-	for ci in range(ncole):	
-		vmin = sys.float_info.max
-		vmax = sys.float_info.min
-		for r in tdata:
-			cv = r[ci]
-			vmin = cv if cv < vmin else vmin
-			vmax = cv if cv > vmax else vmax
-		mm = (vmin, vmax, vmax - vmin)
-		minMax.append(mm)
-
-	return minMax
+	profiler = ColumnProfiler(columns).addFile(dirPath, delim)
+	return profiler.getMinMax(dtype)
 
 
 def getRecAsTypedRecord(rec, types, delim=None):
@@ -1077,7 +1548,7 @@ def extractTypesFromString(types):
 			cvalues[cindex] = sitems
 	return (dtypes, cvalues)
 	
-def getMultipleFileAsInttMatrix(dirPathWithCol,  delim=","):
+def getMultipleFileAsInttMatrix(dirPathWithCol,  delim=",", njobs=1):
 	"""
 	extracts int matrix from from csv files given column index for each file. 
 	num of columns  = number of rows in each file and num of rows = number of files
@@ -1085,11 +1556,17 @@ def getMultipleFileAsInttMatrix(dirPathWithCol,  delim=","):
 	Parameters
 		dirPathWithCol: list of file path and collumn index pair
 		delim : delemeter
+		njobs : number of processes for parsing files in parallel
 	"""
 	mat = list()
 	minLen = -1
-	for path, col in dirPathWithCol:
-		colVals = getFileColumnAsInt(path, col, delim)
+	args = map(lambda pc : (pc[0], pc[1], "int", delim), dirPathWithCol)
+	if njobs == 1:
+		colValsList = map(lambda a : getFileColumnAsArray(*a), args)
+	else:
+		colValsList = parallelMapGen(getFileColumnAsArray, args, njobs, True)
+	for colVals in colValsList:
+		colVals = colVals.tolist()
 		if minLen < 0 or len(colVals) < minLen:
 			minLen = len(colVals)
 		mat.append(colVals)
@@ -1098,7 +1575,7 @@ def getMultipleFileAsInttMatrix(dirPathWithCol,  delim=","):
 	mat = list(map(lambda li:li[:minLen], mat))	
 	return mat
 
-def getMultipleFileAsFloatMatrix(dirPathWithCol,  delim=","):
+def getMultipleFileAsFloatMatrix(dirPathWithCol,  delim=",", njobs=1):
 	"""
 	extracts float matrix from from csv files given column index for each file. 
 	num of columns  = number of rows in each file and num of rows = number of files
@@ -1106,11 +1583,17 @@ def getMultipleFileAsFloatMatrix(dirPathWithCol,  delim=","):
 	Parameters
 		dirPathWithCol: list of file path and collumn index pair
 		delim : delemeter
+		njobs : number of processes for parsing files in parallel
 	"""
 	mat = list()
 	minLen = -1
-	for path, col in dirPathWithCol:
-		colVals = getFileColumnAsFloat(path, col, delim)
+	args = map(lambda pc : (pc[0], pc[1], "float", delim), dirPathWithCol)
+	if njobs == 1:
+		colValsList = map(lambda a : getFileColumnAsArray(*a), args)
+	else:
+		colValsList = parallelMapGen(getFileColumnAsArray, args, njobs, True)
+	for colVals in colValsList:
+		colVals = colVals.tolist()
 		if minLen < 0 or len(colVals) < minLen:
 			minLen = len(colVals)
 		mat.append(colVals)
@@ -1236,7 +1719,7 @@ def fileRecGen(filePath, delim = ","):
 		filePath ; file path
 		delim : delemeter
 	"""
-	with open(filePath, "r") as fp:
+	with openTextFile(filePath) as fp:
 		for line in fp:	
 			line = line[:-1]
 			if delim is not None:
@@ -1267,7 +1750,7 @@ def fileFiltRecGen(filePath, filt, delim = ","):
 		filt : row filter
 		delim : delemeter
 	"""
-	with open(filePath, "r") as fp:
+	with openTextFile(filePath) as fp:
 		for line in fp:	
 			line = line[:-1]
 			if delim is not None:
@@ -1286,7 +1769,7 @@ def fileFiltSelFieldsRecGen(filePath, filt, columns, delim = ","):
 		delim : delemeter
 	"""
 	columns = strToIntArray(columns, delim)
-	with open(filePath, "r") as fp:
+	with openTextFile(filePath) as fp:
 		for line in fp:	
 			line = line[:-1]
 			if delim is not None:
@@ -1304,21 +1787,8 @@ def fileTypedRecGen(filePath, ftypes, delim = ","):
 		ftypes : list of field types
 		delim : delemeter
 	"""
-	with open(filePath, "r") as fp:
-		for line in fp:	
-			line = line[:-1]
-			line = line.split(delim)
-			for i in range(0, len(ftypes), 2):
-				ci = ftypes[i]
-				dtype = ftypes[i+1]
-				assertLesser(ci, len(line), "index out of bound")
-				if dtype == "int":
-					line[ci] = int(line[ci])
-				elif dtype == "float":
-					line[ci] = float(line[ci])
-				else:
-					exitWithMsg("invalid data type")
-			yield line
+	reader = TypedFileReader(ftypes)
+	yield from reader.recGen(filePath, delim)
 
 def fileMutatedFieldsRecGen(dirPath, mutator, delim=","):
 	"""
@@ -1503,6 +1973,124 @@ def hourOfDay(ts):
 	hod = int(rem / secInHour)
 	return hod
 	
+def __epochSecArr(ts):
+	"""
+	time stamp array in sec as float array and flag for datetime64 input
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+	"""
+	ts = np.asarray(ts)
+	isDt = np.issubdtype(ts.dtype, np.datetime64)
+	sec = ts.astype("datetime64[ns]").astype(np.int64) / 1.0e9 if isDt else ts.astype(np.float64)
+	return (sec, isDt)
+
+def __alignArr(ts, intv):
+	"""
+	aligned time array, returned as datetime64 for datetime64 input
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+		intv : alignment interval in sec
+	"""
+	(sec, isDt) = __epochSecArr(ts)
+	aligned = np.trunc(sec / intv) * intv
+	if isDt:
+		aligned = aligned.astype(np.int64).astype("datetime64[s]")
+	elif type(intv) == int:
+		aligned = aligned.astype(np.int64)
+	return aligned
+
+def minuteAlignArr(ts):
+	"""
+	minute aligned time for array of time stamps
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+	"""
+	return __alignArr(ts, secInMinute)
+
+def multMinuteAlignArr(ts, min):
+	"""
+	multi minute aligned time for array of time stamps
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+		min : minute value
+	"""
+	return __alignArr(ts, secInMinute * min)
+
+def hourAlignArr(ts):
+	"""
+	hour aligned time for array of time stamps
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+	"""
+	return __alignArr(ts, secInHour)
+
+def dayAlignArr(ts):
+	"""
+	day aligned time for array of time stamps
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+	"""
+	return __alignArr(ts, secInDay)
+
+def timeAlignArr(ts, unit):
+	"""
+	boundary alignment of time for array of time stamps
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+		unit : unit of time
+	"""
+	if unit == "s":
+		alignedTs = np.asarray(ts)
+	elif unit == "m":
+		alignedTs = minuteAlignArr(ts)
+	elif unit == "h":
+		alignedTs = hourAlignArr(ts)
+	elif unit == "d":
+		alignedTs = dayAlignArr(ts)
+	else:
+		raise ValueError("invalid time unit")
+	return 	alignedTs
+
+def monthOfYearArr(ts):
+	"""
+	month of year for array of time stamps
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+	"""
+	(sec, isDt) = __epochSecArr(ts)
+	rem = np.mod(sec, secInYear)
+	return np.floor(rem / secInMonth).astype(np.int64)
+		
+def dayOfWeekArr(ts):
+	"""
+	day of week for array of time stamps
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+	"""
+	(sec, isDt) = __epochSecArr(ts)
+	rem = np.mod(sec, secInWeek)
+	return np.floor(rem / secInDay).astype(np.int64)
+
+def hourOfDayArr(ts):
+	"""
+	hour of day for array of time stamps
+
+	Parameters
+		ts : time stamp in sec array or datetime64 array
+	"""
+	(sec, isDt) = __epochSecArr(ts)
+	rem = np.mod(sec, secInDay)
+	return np.floor(rem / secInHour).astype(np.int64)
+	
 def processCmdLineArgs(expectedTypes, usage):
 	"""
 	process command line args and returns args as typed values
@@ -1911,26 +2499,126 @@ def drawHist(ldata, myTitle, myXlabel, myYlabel, nbins=10):
 	plt.ylabel(myYlabel)
 	plt.show()	
 	
-def saveObject(obj, filePath):
+def saveObject(obj, filePath, compression=None):
 	"""
-	saves an object
+	saves an object with pickle protocol 5, numpy array data written out of band without copy and aligned, 
+	so that it can be memory mapped on restore. Written to temporary file and renamed, so that an 
+	existing file is replaced only by a complete one
 
 	Parameters
 		obj : object
 		filePath : file path for saved object
+		compression : None, zstd or lz4
+	"""
+	assertInList(compression, [None, "zstd", "lz4"], "invalid compression")
+	buffers = list()
+	pdata = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+	segments = [memoryview(pdata)] + list(map(lambda b : b.raw(), buffers))
+	if compression == "zstd":
+		comp = zstandard.ZstdCompressor(threads=-1)
+		segments = list(map(lambda sg : comp.compress(sg), segments))
+	elif compression == "lz4":
+		segments = list(map(lambda sg : lz4frame.compress(sg), segments))
+	
+	#header with format version and segment sizes, followed by aligned segments
+	header = {"version" : objVersion, "compression" : compression, "sizes" : list(map(lambda sg : sg.nbytes \
+	if isinstance(sg, memoryview) else len(sg), segments))}
+	hdata = json.dumps(header).encode("utf-8")
+	(fd, tmpPath) = tempFileFor(filePath)
+	try:
+		with os.fdopen(fd, "wb") as outfile:
+			outfile.write(objMagic + struct.pack("<I", len(hdata)) + hdata)
+			for sg in segments:
+				pos = outfile.tell()
+				if pos % objAlign > 0:
+					outfile.write(b"\x00" * (objAlign - pos % objAlign))
+				outfile.write(sg)
+			outfile.flush()
+			os.fsync(outfile.fileno())
+		os.replace(tmpPath, filePath)
+	finally:
+		if os.path.exists(tmpPath):
+			os.remove(tmpPath)
+	
+def tempFileFor(filePath, suffix=".tmp"):
+	"""
+	uniquely named temporary file in the same directory as a file, created with mode 666 so that the 
+	process umask applies as for a file created by open, to be renamed to the file once written. Returns 
+	file descriptor and path
+
+	Parameters
+		filePath : path of file to be written
+		suffix : temporary file name suffix
+	"""
+	dirPath, fname = os.path.split(os.path.abspath(filePath))
+	while True:
+		tmpPath = os.path.join(dirPath, "." + fname + "." + uuid.uuid4().hex + suffix)
+		try:
+			fd = os.open(tmpPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+			return (fd, tmpPath)
+		except FileExistsError:
+			pass
+
+def saveArrayAtomic(filePath, data):
 	"""
-	with open(filePath, "wb") as outfile:
-		pickle.dump(obj,outfile)
-	
-def restoreObject(filePath):
+	saves array as npy file through a uniquely named temporary file in the same directory and rename, so 
+	that readers and concurrent writers of the same file never see a partial file
+
+	Parameters
+		filePath : npy file path
+		data : array
+	"""
+	(fd, tmpPath) = tempFileFor(filePath, ".tmp.npy")
+	try:
+		with os.fdopen(fd, "wb") as fh:
+			np.save(fh, data)
+		os.replace(tmpPath, filePath)
+	finally:
+		if os.path.exists(tmpPath):
+			os.remove(tmpPath)
+
+def restoreObject(filePath, mmapMode=False):
 	"""
-	restores an object
+	restores an object, also files saved with plain pickle
 
 	Parameters
 		filePath : file path to restore object from
+		mmapMode : if True, numpy arrays of uncompressed file are read only views of memory mapped file
 	"""
 	with open(filePath, "rb") as infile:
-		obj = pickle.load(infile)
+		if infile.read(len(objMagic)) != objMagic:
+			infile.seek(0)
+			return pickle.load(infile)
+		hlen = struct.unpack("<I", infile.read(4))[0]
+		header = json.loads(infile.read(hlen).decode("utf-8"))
+		assertLesserEqual(header["version"], objVersion, "saved object format version not supported")
+		compression = header["compression"]
+		
+		#segment locations
+		locs = list()
+		pos = len(objMagic) + 4 + hlen
+		for size in header["sizes"]:
+			if pos % objAlign > 0:
+				pos += objAlign - pos % objAlign
+			locs.append((pos, size))
+			pos += size
+		
+		if compression is None and mmapMode:
+			mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+			segments = list(map(lambda l : memoryview(mm)[l[0]:l[0] + l[1]], locs))
+		else:
+			segments = list()
+			for beg, size in locs:
+				infile.seek(beg)
+				sg = np.empty(size, dtype=np.uint8)
+				infile.readinto(sg)
+				segments.append(sg)
+			if compression == "zstd":
+				decomp = zstandard.ZstdDecompressor()
+				segments = list(map(lambda sg : bytearray(decomp.decompress(sg)), segments))
+			elif compression == "lz4":
+				segments = list(map(lambda sg : lz4frame.decompress(sg, return_bytearray=True), segments))
+	obj = pickle.loads(segments[0], buffers=segments[1:])
 	return obj
 
 def isNumeric(data):
@@ -2083,15 +2771,16 @@ def maxListDist(l1, l2):
 
 def fileLineCount(fPath):
 	""" 
-	number of lines ina file 
+	number of lines ina file, using persisted line index for uncompressed file
 
 	Parameters
 		fPath : file path
 	"""
-	with open(fPath) as f:
-		for i, li in enumerate(f):
-			pass
-	return (i + 1)
+	if getFileCompression(fPath) is not None:
+		with openTextFile(fPath) as fp:
+			count = sum(1 for li in fp)
+		return count
+	return LineIndex(fPath).lineCount()
 
 def getAlphaNumCharCount(sdata):
 	""" 
@@ -2119,7 +2808,7 @@ def getAlphaNumCharCount(sdata):
 			
 class StepFunction:
 	"""
-	step function
+	step function, intervals kept as sorted break point arrays for binary search lookup
 
 	Parameters
 
@@ -2132,6 +2821,13 @@ class StepFunction:
 			values : list of tuples, wich each tuple containing 2 x values and corresponding y value
 		"""
 		self.points = values
+		spoints = sorted(values, key=lambda p : p[0])
+		self.xbeg = np.array(list(map(lambda p : p[0], spoints)))
+		self.xend = np.array(list(map(lambda p : p[1], spoints)))
+		self.yval = np.array(list(map(lambda p : p[2], spoints)))
+		self.lbeg = list(map(lambda p : p[0], spoints))
+		self.lend = list(map(lambda p : p[1], spoints))
+		self.lyval = list(map(lambda p : p[2], spoints))
 	
 	def find(self, x):
 		"""
@@ -2140,21 +2836,34 @@ class StepFunction:
 		Parameters
 			x : x value
 		"""
-		found = False
-		y = 0
-		for p in self.points:
-			if (x >= p[0] and x < p[1]):
-				y = p[2]
-				found = True
-				break
-		
-		if not found:
+		i = bisect.bisect_right(self.lbeg, x) - 1
+		if i >= 0 and x < self.lend[i]:
+			y = self.lyval[i]
+		else:
+			y = 0
 			l = len(self.points)
 			if (x < self.points[0][0]):
 				y = self.points[0][2]
 			elif (x > self.points[l-1][1]):
 				y = self.points[l-1][2]
 		return y
+	
+	def findMany(self, x):
+		"""
+		finds step function values for an array of x values
+		
+		Parameters
+			x : x value array
+		"""
+		x = np.asarray(x)
+		i = np.searchsorted(self.xbeg, x, side="right") - 1
+		ic = np.maximum(i, 0)
+		found = (i >= 0) & (x < self.xend[ic])
+		l = len(self.points)
+		y = np.where(found, self.yval[ic], 0)
+		y = np.where(~found & (x < self.points[0][0]), self.points[0][2], y)
+		y = np.where(~found & (x > self.points[l-1][1]), self.points[l-1][2], y)
+		return y
 		
 	 
 class DummyVarGenerator:
@@ -2183,6 +2892,18 @@ class DummyVarGenerator:
 		self.trueVal = trueVal
 		self.falseVal = falseVal
 		self.delim = delim
+		
+		#output column for each input column and for each categorical value
+		self.outCols = dict()
+		self.valCols = dict()
+		oc = 0
+		for i in range(rowSize):
+			self.outCols[i] = oc
+			if i in self.catValues:
+				self.valCols[i] = dict(map(lambda v : (v[1], oc + v[0]), enumerate(self.catValues[i])))
+				oc += len(self.catValues[i])
+			else:
+				oc += 1
 	
 	def processRow(self, row):	
 		"""
@@ -2201,18 +2922,712 @@ class DummyVarGenerator:
 		newRowArr = []
 		for i in range(len(rowArr)):
 			curVal = rowArr[i]
-			if (i in self.catValues):
-				values = self.catValues[i]
-				for val in values:
-					if val == curVal:
-						newVal = self.trueVal
-					else:
-						newVal = self.falseVal
-					newRowArr.append(newVal)
+			if (i in self.valCols):
+				vcols = self.valCols[i]
+				encVals = [self.falseVal] * len(vcols)
+				oc = vcols.get(curVal)
+				if oc is not None:
+					encVals[oc - self.outCols[i]] = self.trueVal
+				newRowArr.extend(encVals)
 			else:
 				newRowArr.append(curVal)
 		assert len(newRowArr) == self.newRowSize, "invalid new row size " + str(len(newRowArr)) + " expected " + str(self.newRowSize)
 		encRow = self.delim.join(newRowArr) if self.delim is not None else newRowArr
 		return encRow
+
+	def __splitRows(self, rows, numDtype=None):
+		"""
+		rows as list of column arrays, delemeter separated rows parsed with pandas C parser
+		
+		Parameters
+			rows : list of rows, each row either delemeter separated string or list
+			numDtype : data type for non categorical columns, strings kept if None
+		"""
+		ctypes = dict(map(lambda i : (i, str if i in self.catValues or numDtype is None else numDtype), range(self.rowSize)))
+		if self.delim is not None:
+			text = "\n".join(map(lambda r : r.rstrip("\n"), rows))
+			df = pd.read_csv(io.StringIO(text), sep=self.delim, header=None, dtype=ctypes, na_filter=False, 
+			quoting=3, engine="c" if len(self.delim) == 1 else "python", 
+			float_precision="round_trip" if len(self.delim) == 1 else None)
+			assert df.shape[1] == self.rowSize, "rows do not have expected number of columns " + str(self.rowSize)
+			data = list(map(lambda i : df[i].to_numpy(), range(self.rowSize)))
+		else:
+			assert all(map(lambda r : len(r) == self.rowSize, rows)), "rows do not have expected number of columns " + str(self.rowSize)
+			cols = list(zip(*rows)) if len(rows) > 0 else [()] * self.rowSize
+			data = list(map(lambda i : np.array(cols[i], dtype=object if ctypes[i] == str else ctypes[i]), range(self.rowSize)))
+		return data
+
+	def __trueCells(self, data):
+		"""
+		row and column indexes of true values for all categorical variables
+		
+		Parameters
+			data : 2D string array
+		"""
+		rowIndexes = list()
+		colIndexes = list()
+		for i, vcols in self.valCols.items():
+			codes, uniq = pd.factorize(data[i])
+			ucols = np.array(list(map(lambda u : vcols.get(u, -1), uniq)) + [-1], dtype=np.int64)
+			cols = ucols[codes]
+			valid = cols >= 0
+			rowIndexes.append(np.flatnonzero(valid))
+			colIndexes.append(cols[valid])
+		if len(rowIndexes) == 0:
+			return (np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+		return (np.concatenate(rowIndexes), np.concatenate(colIndexes))
+
+	def encodeBatch(self, rows, dtype=np.float64, asSparse=False):
+		"""
+		encodes chunk of rows into numeric matrix with 1 and 0 for dummy variables, other columns must be numeric
+		
+		Parameters
+			rows : list of rows, each row either delemeter separated string or list
+			dtype : matrix data type
+			asSparse : if True returns scipy sparse csr matrix
+		"""
+		data = self.__splitRows(rows, dtype)
+		nrow = len(rows)
+		(ri, ci) = self.__trueCells(data)
+		numCols = list(filter(lambda i : i not in self.catValues, range(self.rowSize)))
+		if asSparse:
+			nri = list(map(lambda i : np.arange(nrow), numCols))
+			nci = list(map(lambda i : np.full(nrow, self.outCols[i]), numCols))
+			nval = list(map(lambda i : data[i], numCols))
+			ri = np.concatenate([ri] + nri)
+			ci = np.concatenate([ci] + nci)
+			val = np.concatenate([np.ones(len(ri) - nrow * len(numCols), dtype=dtype)] + nval)
+			mat = sparse.csr_matrix((val, (ri, ci)), shape=(nrow, self.newRowSize), dtype=dtype)
+		else:
+			mat = np.zeros((nrow, self.newRowSize), dtype=dtype)
+			mat[ri, ci] = 1
+			for i in numCols:
+				mat[:,self.outCols[i]] = data[i]
+		return mat
+
+	def encodeBatchAsStr(self, rows):
+		"""
+		encodes chunk of rows, returning as delemeter separated strings or lists, same as processRow
+		
+		Parameters
+			rows : list of rows, each row either delemeter separated string or list
+		"""
+		data = self.__splitRows(rows)
+		nrow = len(rows)
+		enc = np.empty((nrow, self.newRowSize), dtype=object)
+		enc[:,:] = self.falseVal
+		(ri, ci) = self.__trueCells(data)
+		enc[ri, ci] = self.trueVal
+		for i in range(self.rowSize):
+			if i not in self.catValues:
+				enc[:,self.outCols[i]] = data[i]
+		enc = enc.tolist()
+		return list(map(lambda r : self.delim.join(r), enc)) if self.delim is not None else enc
+
+	def encodeFile(self, inFilePath, outFilePath=None, chunkSize=100000):
+		"""
+		streaming encoding of file in chunks of rows
+		
+		Parameters
+			inFilePath : input file path
+			outFilePath : output file path, standard output if None
+			chunkSize : number of rows in a chunk
+		"""
+		assert self.delim is not None, "delemeter required for file encoding"
+		with openTextFile(inFilePath) as fp:
+			ofp = open(outFilePath, "w") if outFilePath is not None else sys.stdout
+			try:
+				while True:
+					rows = list(itertools.islice(fp, chunkSize))
+					if len(rows) == 0:
+						break
+					ofp.write("\n".join(self.encodeBatchAsStr(rows)) + "\n")
+			finally:
+				if outFilePath is not None:
+					ofp.close()
+		
+		
+
+class TypedFileReader:
+	"""
+	delimited file reader with schema compiled once, parses in chunks straight into typed column arrays
+	"""
+	def __init__(self, types, columns=None):
+		"""
+		initilizer
+		
+		Parameters
+			types : encoded type information as idx:type coma separated string or list of alternating index and type
+			columns : column indexes to extract, None for all columns
+		"""
+		if type(types) == list:
+			types = ",".join(map(lambda i : str(types[i]) + ":" + types[i+1], range(0, len(types), 2)))
+		(dtypes, cvalues) = extractTypesFromString(types)
+		self.dtypes = dtypes
+		self.columns = columns
+		if self.columns is not None:
+			for c in self.columns:
+				assertInList(c, list(dtypes.keys()), "type not specified for column " + str(c))
+
+	def __colType(self, ci):
+		"""
+		numpy type for column
+		
+		Parameters
+			ci : column index
+		"""
+		dtype = self.dtypes.get(ci)
+		if dtype == "int":
+			ctype = np.int64
+		elif dtype == "float":
+			ctype = np.float64
+		else:
+			ctype = str
+		return ctype
+
+	def __compile(self, filePath, delim):
+		"""
+		compiles schema into number of fields, column selection and column type map
+		
+		Parameters
+			filePath : file path
+			delim : delemeter
+		"""
+		with openTextFile(filePath) as fp:
+			line = fp.readline()
+		if len(line) == 0:
+			return None
+		nfields = line.count(delim) + 1
+		for ci in self.dtypes.keys():
+			assertLesser(ci, nfields, "index out of bound")
+		columns = list(range(nfields)) if self.columns is None else self.columns
+		ctypes = dict(map(lambda c : (c, self.__colType(c)), columns))
+		return (nfields, columns, ctypes)
+
+	def chunkGen(self, filePath, delim=",", chunkSize=100000):
+		"""
+		generates list of typed column arrays, one for each chunk of rows. All rows including blank
+		ones should have as many fields as the first row. Columns without type are returned as string
+		
+		Parameters
+			filePath : file path
+			delim : delemeter
+			chunkSize : number of rows in a chunk
+		"""
+		compiled = self.__compile(filePath, delim)
+		if compiled is None:
+			return
+		(nfields, columns, ctypes) = compiled
+		lineNum = 0
+		with openTextFile(filePath) as fp:
+			while True:
+				lines = list(itertools.islice(fp, chunkSize))
+				if len(lines) == 0:
+					break
+				
+				#field count validated, as the parser would otherwise pad or reject ragged rows
+				counts = np.fromiter(map(lambda l : l.count(delim), lines), dtype=np.int64, count=len(lines))
+				bad = np.flatnonzero(counts != nfields - 1)
+				if len(bad) > 0:
+					i = bad[0]
+					raise ValueError("line {} has {} fields, expecting {} as in first line".format(lineNum + i + 1, 
+					counts[i] + 1, nfields))
+				lineNum += len(lines)
+				
+				chunk = pd.read_csv(io.StringIO("".join(lines)), sep=delim, header=None, names=list(range(nfields)), 
+				usecols=columns, dtype=ctypes, quoting=3, na_filter=False, skip_blank_lines=False, 
+				engine="c" if len(delim) == 1 else "python", float_precision="round_trip" if len(delim) == 1 else None)
+				yield list(map(lambda c : chunk[c].to_numpy(), columns))
+
+	def read(self, filePath, delim=",", chunkSize=100000):
+		"""
+		reads whole file as list of typed column arrays
+		
+		Parameters
+			filePath : file path
+			delim : delemeter
+			chunkSize : number of rows in a chunk
+		"""
+		chunks = list(self.chunkGen(filePath, delim, chunkSize))
+		if len(chunks) == 0:
+			return list()
+		return list(map(lambda i : np.concatenate(list(map(lambda ch : ch[i], chunks))), range(len(chunks[0]))))
+
+	def readRecArray(self, filePath, delim=",", chunkSize=100000):
+		"""
+		reads whole file as record array with fields named by column index e.g f0, f1
+		
+		Parameters
+			filePath : file path
+			delim : delemeter
+			chunkSize : number of rows in a chunk
+		"""
+		cols = self.read(filePath, delim, chunkSize)
+		columns = self.columns if self.columns is not None else list(range(len(cols)))
+		names = list(map(lambda c : "f" + str(c), columns))
+		return np.rec.fromarrays(cols, names=names)
+
+	def recGen(self, filePath, delim=",", chunkSize=100000):
+		"""
+		generates typed records as list with native python values
+		
+		Parameters
+			filePath : file path
+			delim : delemeter
+			chunkSize : number of rows in a chunk
+		"""
+		for cols in self.chunkGen(filePath, delim, chunkSize):
+			cols = list(map(lambda c : c.tolist(), cols))
+			yield from map(list, zip(*cols))
+
+class LineIndex:
+	"""
+	persisted line offset index for random access and sampling on large text files. Index is saved in 
+	the line index cache directory and rebuilt when file modification time or size changes
+	"""
+	version = 1
+	blockSize = 16777216
+
+	def __init__(self, filePath, indexPath=None):
+		"""
+		initilizer
+		
+		Parameters
+			filePath : file path
+			indexPath : index file path, by default in the configured cache directory, None for in memory 
+				index if persistence is disabled
+		"""
+		assert getFileCompression(filePath) is None, "line index requires uncompressed file"
+		self.filePath = filePath
+		if indexPath is None and lineIndexConfig["enabled"]:
+			#named by file name and hash of absolute path
+			absPath = os.path.abspath(filePath)
+			cacheDir = lineIndexConfig["cacheDir"] if lineIndexConfig["cacheDir"] is not None else userCacheDir("lidx")
+			pathKey = hashlib.sha1(absPath.encode()).hexdigest()[:16]
+			indexPath = os.path.join(cacheDir, os.path.basename(absPath) + "." + pathKey + ".lidx.npy")
+		self.indexPath = indexPath
+		self.offsets = None
+		self.__load()
+
+	def __fileStat(self):
+		"""
+		file modification time and size
+		"""
+		st = os.stat(self.filePath)
+		return (st.st_mtime_ns, st.st_size)
+
+	def __load(self):
+		"""
+		loads persisted index if valid, otherwise builds and saves
+		"""
+		(mtime, size) = self.__fileStat()
+		if self.indexPath is not None and os.path.exists(self.indexPath):
+			try:
+				index = np.load(self.indexPath, mmap_mode="r")
+				if len(index) >= 3 and index[0] == LineIndex.version and index[1] == mtime and index[2] == size:
+					self.offsets = index[3:]
+					return
+			except (OSError, ValueError):
+				pass
+		self.__build(mtime, size)
+
+	def __build(self, mtime, size):
+		"""
+		builds index with one pass over file in large blocks and saves it
+		
+		Parameters
+			mtime : file modification time
+			size : file size
+		"""
+		starts = [np.zeros(1, dtype=np.int64)]
+		pos = 0
+		with open(self.filePath, "rb") as fp:
+			while True:
+				block = fp.read(LineIndex.blockSize)
+				if len(block) == 0:
+					break
+				nl = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+				starts.append(nl.astype(np.int64) + pos + 1)
+				pos += len(block)
+		starts = np.concatenate(starts)
+		
+		#line starts followed by end of file, last start dropped if file ends with new line
+		if len(starts) > 1 and starts[-1] == pos:
+			starts = starts[:-1]
+		if pos == 0:
+			starts = starts[:0]
+		header = np.array([LineIndex.version, mtime, size], dtype=np.int64)
+		index = np.concatenate([header, starts, np.array([pos], dtype=np.int64)])
+		
+		#atomic save, index kept in memory only if not persisted or cache location not writable
+		if self.indexPath is not None:
+			try:
+				os.makedirs(os.path.dirname(os.path.abspath(self.indexPath)), exist_ok=True)
+				saveArrayAtomic(self.indexPath, index)
+			except OSError:
+				pass
+		self.offsets = index[3:]
+
+	def lineCount(self):
+		"""
+		number of lines
+		"""
+		return len(self.offsets) - 1
+
+	def getLine(self, i, delim=None):
+		"""
+		gets line with given index
+		
+		Parameters
+			i : line index
+			delim : delemeter, if not None line is split into fields
+		"""
+		return next(self.lineGen([i], delim))
+
+	def lineGen(self, indexes, delim=None):
+		"""
+		generates lines for given line indexes reading only those lines
 		
+		Parameters
+			indexes : line indexes in the order lines are to be returned
+			delim : delemeter, if not None line is split into fields
+		"""
+		nlines = self.lineCount()
+		with open(self.filePath, "rb") as fp:
+			for i in indexes:
+				assertWithinRange(i, 0, nlines - 1, "line index out of range")
+				beg = int(self.offsets[i])
+				fp.seek(beg)
+				line = fp.read(int(self.offsets[i+1]) - beg).decode("utf-8")
+				
+				#line ending removed as with text mode read, including carriage return
+				if line.endswith("\n"):
+					line = line[:-1]
+				if line.endswith("\r"):
+					line = line[:-1]
+				if delim is not None:
+					line = line.split(delim)
+				yield line
+
+	def getLines(self, indexes, delim=None):
+		"""
+		gets lines for given line indexes
+		
+		Parameters
+			indexes : line indexes
+			delim : delemeter, if not None line is split into fields
+		"""
+		return list(self.lineGen(indexes, delim))
+
+	def sampleIndexes(self, size, seed=None):
+		"""
+		uniform random sample of line indexes without replacement with exact size, sorted
+		
+		Parameters
+			size : sample size
+			seed : random seed, module level random generator used if None
+		"""
+		nlines = self.lineCount()
+		assertLesserEqual(size, nlines, "sample size larger than number of lines")
+		rgen = random if seed is None else random.Random(seed)
+		return sorted(rgen.sample(range(nlines), size))
+
+	def sample(self, size, delim=None, seed=None):
+		"""
+		uniform random sample of lines without replacement with exact size, in file order
+		
+		Parameters
+			size : sample size
+			delim : delemeter, if not None line is split into fields
+			seed : random seed
+		"""
+		return self.getLines(self.sampleIndexes(size, seed), delim)
+
+	def split(self, valFrac, seed=None):
+		"""
+		random train and validation split of line indexes, each sorted
+		
+		Parameters
+			valFrac : validation fraction
+			seed : random seed
+		"""
+		assertWithinRange(valFrac, 0, 1.0, "validation fraction should be between 0 and 1")
+		nlines = self.lineCount()
+		vindexes = self.sampleIndexes(int(round(nlines * valFrac)), seed)
+		isVal = np.zeros(nlines, dtype=bool)
+		isVal[vindexes] = True
+		tindexes = np.flatnonzero(~isVal)
+		return (tindexes, np.array(vindexes, dtype=np.int64))
+
+class ColumnProfiler:
+	"""
+	single pass streaming column profiler with constant memory, computes count, null count, min, max, range, 
+	mean, variance and distinct count estimate with k minimum values sketch, data added in chunks
+	"""
+	def __init__(self, columns, sketchSize=1024):
+		"""
+		initilizer
+		
+		Parameters
+			columns : column indexes
+			sketchSize : number of minimum hash values kept for distinct count estimate
+		"""
+		self.columns = list(columns)
+		ncol = len(self.columns)
+		self.sketchSize = sketchSize
+		self.count = np.zeros(ncol, dtype=np.int64)
+		self.nulls = np.zeros(ncol, dtype=np.int64)
+		self.vmin = np.full(ncol, np.inf)
+		self.vmax = np.full(ncol, -np.inf)
+		self.mean = np.zeros(ncol)
+		self.m2 = np.zeros(ncol)
+		self.sketches = list(map(lambda c : np.array([], dtype=np.uint64), self.columns))
+
+	@staticmethod
+	def hashValues(values):
+		"""
+		64 bit hash of float values with splitmix64 finalizer
+		
+		Parameters
+			values : float array
+		"""
+		h = (values + 0.0).view(np.uint64)
+		with np.errstate(over="ignore"):
+			h = (h ^ (h >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+			h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+			h = h ^ (h >> np.uint64(31))
+		return h
+
+	def add(self, data):
+		"""
+		adds chunk of rows
+		
+		Parameters
+			data : 2D array with one column for each profiled column, nan for nulls
+		"""
+		data = np.asarray(data, dtype=np.float64)
+		if data.ndim == 1:
+			data = data.reshape(-1, 1)
+		assertEqual(data.shape[1], len(self.columns), "number of columns not as expected")
+		for i in range(data.shape[1]):
+			col = data[:,i]
+			valid = ~np.isnan(col)
+			self.nulls[i] += len(col) - np.count_nonzero(valid)
+			col = col[valid]
+			n = len(col)
+			if n == 0:
+				continue
+			self.vmin[i] = min(self.vmin[i], col.min())
+			self.vmax[i] = max(self.vmax[i], col.max())
+			
+			#merge chunk moments
+			cmean = col.mean()
+			cm2 = ((col - cmean) ** 2).sum()
+			tcount = self.count[i] + n
+			delta = cmean - self.mean[i]
+			self.mean[i] += delta * n / tcount
+			self.m2[i] += cm2 + delta * delta * self.count[i] * n / tcount
+			self.count[i] = tcount
+			
+			#keep smallest distinct hashes
+			hashes = np.unique(np.concatenate([self.sketches[i], np.unique(ColumnProfiler.hashValues(col))]))
+			self.sketches[i] = hashes[:self.sketchSize]
+
+	def addFile(self, filePath, delim=",", chunkSize=100000):
+		"""
+		adds columns of a file, empty fields counted as nulls
 		
+		Parameters
+			filePath : file path
+			delim : delemeter
+			chunkSize : number of rows in a chunk
+		"""
+		ctypes = dict(map(lambda c : (c, np.float64), self.columns))
+		with openTextFile(filePath) as fp:
+			reader = pd.read_csv(fp, sep=delim, header=None, usecols=self.columns, dtype=ctypes, quoting=3, 
+			chunksize=chunkSize, engine="c" if len(delim) == 1 else "python", 
+			float_precision="round_trip" if len(delim) == 1 else None)
+			with reader:
+				for chunk in reader:
+					self.add(chunk[self.columns].to_numpy())
+		return self
+
+	def getDistinctCount(self, i):
+		"""
+		distinct count estimate, exact when fewer distinct values than sketch size
+		
+		Parameters
+			i : position of column in profiled columns
+		"""
+		hashes = self.sketches[i]
+		if len(hashes) < self.sketchSize:
+			return len(hashes)
+		return int(round((self.sketchSize - 1) * 2.0 ** 64 / (float(hashes[-1]) + 1.0)))
+
+	def getStat(self):
+		"""
+		list of stats dictionary, one for each column
+		"""
+		stats = list()
+		for i, c in enumerate(self.columns):
+			count = int(self.count[i])
+			st = dict()
+			st["column"] = c
+			st["count"] = count
+			st["nulls"] = int(self.nulls[i])
+			st["min"] = float(self.vmin[i]) if count > 0 else None
+			st["max"] = float(self.vmax[i]) if count > 0 else None
+			st["range"] = float(self.vmax[i] - self.vmin[i]) if count > 0 else None
+			st["mean"] = float(self.mean[i]) if count > 0 else None
+			st["var"] = float(self.m2[i] / (count - 1)) if count > 1 else None
+			st["sd"] = math.sqrt(st["var"]) if count > 1 else None
+			st["distinct"] = self.getDistinctCount(i)
+			stats.append(st)
+		return stats
+
+	def getMinMax(self, dtype="float"):
+		"""
+		list of min, max and range tuples, one for each column, with None values for a column with no 
+		non null value
+		
+		Parameters
+			dtype : data type int or float
+		"""
+		conv = int if dtype == "int" else float
+		return list(map(lambda st : (conv(st["min"]), conv(st["max"]), conv(st["range"])) if st["count"] > 0 \
+			else (None, None, None), self.getStat()))
+
+class WindowStat:
+	"""
+	stats for a sliding window of values, ring buffer in a preallocated array with O(1) Welford style
+	update of mean and variance when a value enters and the oldest leaves
+	"""
+	def __init__(self, wsize):
+		"""
+		initializer
+		
+		Parameters
+			wsize : window size
+		"""
+		assertGreater(wsize, 0, "window size should be positive")
+		self.wsize = wsize
+		self.buf = np.zeros(wsize)
+		self.pos = 0
+		self.size = 0
+		self.mean = 0.0
+		self.m2 = 0.0
+
+	def add(self, value):
+		"""
+		add a value
+		
+		Parameters
+			value : value to add
+		"""
+		value = float(value)
+		if self.size < self.wsize:
+			self.size += 1
+			delta = value - self.mean
+			self.mean += delta / self.size
+			self.m2 += delta * (value - self.mean)
+		else:
+			old = float(self.buf[self.pos])
+			mean = self.mean + (value - old) / self.wsize
+			self.m2 += (value - old) * (value - mean + old - self.mean)
+			self.mean = mean
+		self.buf[self.pos] = value
+		self.pos += 1
+		if self.pos == self.wsize:
+			self.pos = 0
+			#recompute once per pass over the buffer to stop round off drift, amortized O(1)
+			self.__sync()
+
+	def addMany(self, values):
+		"""
+		add many values in order, vectorized
+		
+		Parameters
+			values : list or array of values
+		"""
+		values = np.asarray(values, dtype=np.float64).ravel()
+		n = len(values)
+		if n == 0:
+			return
+		if n >= self.wsize:
+			self.buf[:] = values[-self.wsize:]
+			self.pos = 0
+			self.size = self.wsize
+		else:
+			end = self.pos + n
+			if end <= self.wsize:
+				self.buf[self.pos:end] = values
+			else:
+				split = self.wsize - self.pos
+				self.buf[self.pos:] = values[:split]
+				self.buf[:end - self.wsize] = values[split:]
+			self.pos = end % self.wsize
+			self.size = min(self.size + n, self.wsize)
+		self.__sync()
+
+	def __sync(self):
+		"""
+		recomputes mean and sum of squared deviation from buffer
+		"""
+		values = self.buf[:self.size]
+		self.mean = float(values.mean()) if self.size > 0 else 0.0
+		dev = values - self.mean
+		self.m2 = float(np.dot(dev, dev))
+
+	def getValues(self):
+		"""
+		window values, oldest first
+		"""
+		if self.size < self.wsize:
+			values = self.buf[:self.size].copy()
+		else:
+			values = np.concatenate((self.buf[self.pos:], self.buf[:self.pos]))
+		return values
+
+	def getMean(self):
+		"""
+		window mean
+		"""
+		assertGreater(self.size, 0, "window is empty")
+		return self.mean
+
+	def getVariance(self):
+		"""
+		window sample variance, 0 for a single value
+		"""
+		assertGreater(self.size, 0, "window is empty")
+		return max(self.m2, 0.0) / (self.size - 1) if self.size > 1 else 0.0
+
+	def getStat(self):
+		"""
+		window mean and sample std deviation
+		"""
+		return (self.getMean(), math.sqrt(self.getVariance()))
+
+	def getQuantile(self, q):
+		"""
+		window quantile, O(window size)
+		
+		Parameters
+			q : quantile or list of quantiles in [0, 1]
+		"""
+		assertGreater(self.size, 0, "window is empty")
+		return np.quantile(self.buf[:self.size], q)
+
+	def getSize(self):
+		"""
+		number of values in window
+		"""
+		return self.size
+
+	def isFull(self):
+		"""
+		True if window is full
+		"""
+		return self.size == self.wsize
+
+__all__ = moduleExports(globals())
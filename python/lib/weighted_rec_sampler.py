@@ -15,47 +15,34 @@
 # implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+import os
 import sys
-from random import randrange
+import numpy as np
 sys.path.append(os.path.abspath("../lib"))
 from util import *
 from sampler import *
 
 # sample
-def sample(data_file, wt_index):
-	# build sampler
-	fp = open(data_file, "r")
-	values = []
-	for line in fp:
-		items = line.split(",")
-		weight = double(items[wt_index])
-		values.append(weight)
-	fp.close()
-	sampler = new NonParamRejectSampler(0, 1, values)
+def sample(data_file, wt_index, size=None):
+	# weights
+	values = getFileColumnAsFloat(data_file, wt_index)
+	weights = np.array(values)
+	weights = weights / weights.sum()
 	
-	# sample
-	sampled_indices = []
-	size = len(values)
-	for i in range(size):
-		sampled_indices.append(sampler.sample())
-	sampled_indices.sort()
+	# sample record indexes with replacement, proportional to weight
+	lindex = LineIndex(data_file)
+	size = lindex.lineCount() if size is None else size
+	sampled_indices = np.sort(np.random.choice(lindex.lineCount(), size, p=weights))
 		
-	# output
-	fp = open(data_file, "r")
-	max_weight = 0
-	i = 0
-	j = 0
-	for line in fp:
-		while sampled_indices[i] == j:
-			print line
-			i = i + 1 
-		j = j + 1
+	# output, only sampled lines are read
+	for line in lindex.lineGen(sampled_indices):
+		print(line)
 		
 
 # main   
-data_file = sys.argv[1]
-id_index = int(sys.argv[2])
-wt_index = int(sys.argv[3]
-
-sample(data_file, wt_index)
-
+if __name__ == "__main__":
+	data_file = sys.argv[1]
+	id_index = int(sys.argv[2])
+	wt_index = int(sys.argv[3])
+	size = int(sys.argv[4]) if len(sys.argv) > 4 else None
+	sample(data_file, wt_index, size)
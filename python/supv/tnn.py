@@ -480,9 +480,10 @@ class FeedForwardNetwork(torch.nn.Module):
 			yPred : predicted output
 			config : config object
 		"""
-		outType = config.getStringConfig("predict.output")[0]
+		snap = config.getSnapshot({"train.output.size" : "int"})
+		outType = snap["predict.output"]
 		if outType == "prob":
-			outputSize = config.getIntConfig("train.output.size")[0]
+			outputSize = snap["train.output.size"]
 			if outputSize == 2:
 				#return prob of pos class for binary classifier 
 				yPred = yPred[:, 1]
@@ -754,22 +754,8 @@ class WordVectorContainer:
 		"""
 		self.getNumWordVectors()
 		
-		size = len(self.wordVectors)
-		simArray = np.empty(shape=(size,size))
-		for i in range(size):
-			simArray[i][i] = 1.0
-		
-		for i in range(size):
-			for j in range(i+1, size):
-				if self.similarityAlgo == "cosine":
-					sim = cosineSimilarity(self.numWordVectors[i], self.numWordVectors[j])
-				elif self.similarityAlgo == "jaccard":
-					sim = jaccardSimilarity(self.wordVectors[i], self.wordVectors[j],\
-						self.simAlgoNormalizer[0], self.simAlgoNormalizer[1])
-				else:
-					raise ValueError("invalid similarity algorithms")
-				simArray[i][j] = sim
-				simArray[j][i] = sim
+		simArray = self.__similarityMatrix(self.__simVectors(), None)
+		np.fill_diagonal(simArray, 1.0)
 		return simArray
 
 	def getInterSetSimilarity(self, byCount, normalized, split):
@@ -777,29 +763,29 @@ class WordVectorContainer:
 		inter set pair wise  similarity
 		"""
 		self.getNumWordVectors()
-		size = len(self.wordVectors)
-		if not self.similarityAlgo == "jaccard":
-			firstNumVec = self.numWordVectors[:split]
-			secNumVec = self.numWordVectors[split:]
-			fiSize = len(firstNumVec)
-			seSize = len(secNumVec)
+		vecs = self.__simVectors()
+		return self.__similarityMatrix(vecs[:split], vecs[split:])
+
+	def __simVectors(self):
+		"""
+		word sets for jaccard, numerical vectors otherwise
+		"""
+		return self.wordVectors if self.similarityAlgo == "jaccard" else self.numWordVectors
+
+	def __similarityMatrix(self, vecs, otherVecs):
+		"""
+		similarity matrix with batched matrix kernels, self similarity if other vectors is None
+		"""
+		if self.similarityAlgo == "cosine":
+			other = None if otherVecs is None else np.array(otherVecs)
+			simArray = np.round(cosineSimilarityMatrix(np.array(vecs), other), 3)
+		elif self.similarityAlgo == "jaccard":
+			setMat = setIndicatorMatrix(vecs if otherVecs is None else vecs + otherVecs)
+			other = None if otherVecs is None else setMat[len(vecs):]
+			simArray = jaccardSimilarityMatrix(setMat[:len(vecs)], other, self.simAlgoNormalizer[0], \
+				self.simAlgoNormalizer[1])
 		else:
-			firstVec = self.wordVectors[:split]
-			secVec = self.wordVectors[split:]
-			fiSize = len(firstVec)
-			seSize = len(secVec)
-		
-		simArray = np.empty(shape=(fiSize,seSize))
-		for i in range(fiSize):
-			for j in range(seSize):
-				if self.similarityAlgo == "cosine":
-					sim = cosineSimilarity(firstNumVec[i], secNumVec[j])
-				elif self.similarityAlgo == "jaccard":
-					sim = jaccardSimilarity(firstVec[i], secVec[j],\
-						self.simAlgoNormalizer[0], self.simAlgoNormalizer[1])
-				else:
-					raise ValueError("invalid similarity algorithms")
-				simArray[i][j] = sim
+			raise ValueError("invalid similarity algorithms")
 		return simArray
 
 	def getNumWordVectors(self):